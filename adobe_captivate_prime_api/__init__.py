@@ -1,2 +1,35 @@
-"""Module providing CaptivatePrimeAPI."""
+"""Module providing CaptivatePrimeAPI, AsyncCaptivatePrimeAPI and their helpers."""
+from .async_captivate_prime_api import AsyncCaptivatePrimeAPI
+from .cache import (
+    ResponseCache,
+    SQLiteCache,
+)
 from .captivate_prime_api import CaptivatePrimeAPI
+from .checkpoint import (
+    Checkpoint,
+    FileCheckpoint,
+    SQLiteCheckpoint,
+)
+from .identity_map import IdentityMap
+from .models import (
+    Badge,
+    Enrollment,
+    Job,
+    LearningObject,
+    Resource,
+    Skill,
+    User,
+    UserGroup,
+)
+from .paging import PagingPolicy
+from .rate_limit import (
+    SQLiteTokenBucket,
+    TokenBucket,
+)
+from .registry import ClientRegistry
+from .retry import RetryPolicy
+from .store import (
+    ConfigFileStore,
+    CredentialStore,
+)
+from .table import Table
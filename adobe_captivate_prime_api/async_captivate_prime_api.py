@@ -0,0 +1,751 @@
+"""This module provides ``AsyncCaptivatePrimeAPI``, the asyncio counterpart of
+``CaptivatePrimeAPI`` built on ``aiohttp``."""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Coroutine,
+)
+
+from .base import (
+    BaseCaptivatePrimeAPI,
+    run_blocking,
+)
+from .cache import (
+    CachedResponse,
+    CacheEntry,
+)
+from .checkpoint import Checkpoint
+from .codec import (
+    loads,
+    next_link,
+)
+from .identity_map import IdentityMap
+from .models import Resource
+from .paging import page_limit
+from .params import (
+    canonical_url,
+    normalize_params,
+)
+from .scan import (
+    aiter_documents,
+    page_records,
+)
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+REFRESH_LOCKS = weakref.WeakKeyDictionary()
+
+
+def refresh_lock(store_lock) -> asyncio.Lock:
+    """Return the ``asyncio.Lock`` serialising token refreshes under
+    ``store_lock`` on the running event loop. Clients sharing a config file
+    share the store's lock, which is reentrant for the event loop thread, so
+    it cannot keep their refreshes apart on its own.
+
+    :param store_lock: the lock returned by ``CredentialStore.lock``
+    :type store_lock: FileLock or threading.RLock
+    :return: asyncio.Lock
+
+    """
+
+    locks = REFRESH_LOCKS.setdefault(asyncio.get_running_loop(), {})
+
+    return locks.setdefault(store_lock, asyncio.Lock())
+
+
+class AsyncResponse:
+    """Fully read ``aiohttp`` response exposing the parts of the
+    ``requests.Response`` interface the client relies on."""
+
+    def __init__(self, status_code: int, reason: str, headers, content: bytes):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    def json(self) -> dict:
+        """Decode the body as JSON.
+
+        :return: dict
+
+        """
+
+        return loads(self.content)
+
+
+class SharedRequest:
+    """Task of a page request shared by coalesced ``get_page`` calls, with the
+    number of calls still waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncCaptivatePrimeAPI(BaseCaptivatePrimeAPI):
+    """AsyncCaptivatePrimeAPI Class.
+
+    Shares configuration and token handling with ``CaptivatePrimeAPI``
+    through ``BaseCaptivatePrimeAPI`` but performs every call on the running
+    event loop through one pooled ``aiohttp.ClientSession``. It is used with
+    ``async with``; ``with`` is not supported. All functions of
+    ``adobe_captivate_prime_api.functions`` accept this client as well: the
+    ``get_*`` functions then return awaitables and the ``iter_*`` functions
+    return async iterators.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.background_tasks = set()
+        super().__init__(*args, **kwargs)
+
+    def init_session(  # pylint:disable=too-many-arguments
+        self,
+        session=None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        """Use ``session`` (an ``aiohttp.ClientSession``) or remember the pool
+        settings; the ``aiohttp`` session is created lazily because it has to
+        be bound to the running event loop.
+
+        ``pool_maxsize`` limits the connections per host and the total limit
+        is ``pool_connections * pool_maxsize``. Requests over the limit always
+        wait for a free connection, so ``pool_block`` has no effect here.
+
+        :param session: aiohttp.ClientSession
+        :type session: aiohttp.ClientSession
+        :param pool_connections: int
+        :param pool_maxsize: int
+        :param pool_block: bool
+        :param keep_alive: bool
+
+        """
+
+        self.aiohttp_session = session
+        self.connector_options = {
+            "limit": pool_connections * pool_maxsize,
+            "limit_per_host": pool_maxsize,
+            "force_close": not keep_alive,
+        }
+
+    def get_session(self):
+        """Return the ``aiohttp`` session, creating it on first use.
+
+        :return: aiohttp.ClientSession
+        :rtype: aiohttp.ClientSession
+        :raises ImportError: aiohttp is not installed.
+
+        """
+
+        if self.aiohttp_session is None or self.aiohttp_session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    "AsyncCaptivatePrimeAPI requires aiohttp: pip install aiohttp"
+                ) from e
+
+            self.aiohttp_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self.connector_options)
+            )
+
+        return self.aiohttp_session
+
+    async def close(self) -> None:
+        """Close the ``aiohttp`` session and release its pooled connections,
+        unless the session was passed in by the caller. Pending background
+        refreshes are cancelled."""
+
+        for task in list(self.background_tasks):
+            task.cancel()
+        if self.owns_session and self.aiohttp_session is not None:
+            await self.aiohttp_session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def fetch(
+        self,
+        method: str,
+        endpoint: str = None,
+        params: dict = None,
+        stream: bool = False,
+        **options,
+    ) -> Coroutine | AsyncIterator[dict]:
+        """Generic API call function.
+
+        Returns an awaitable resolving to the list of every record. With
+        ``stream`` an async iterator over the records is returned instead.
+
+        :param method: str
+        :param endpoint: str
+        :param params: dict
+        :param stream: bool
+        :param options: keyword arguments of ``iter_fetch``
+        :return: Coroutine or AsyncIterator[dict]
+
+        """
+
+        records = self.iter_fetch(
+            method=method, endpoint=endpoint, params=params, **options
+        )
+
+        return records if stream else self.collect(records)
+
+    @staticmethod
+    async def collect(records: AsyncIterator[dict]) -> list:
+        """Collect every record of an async iterator into a list.
+
+        :param records: AsyncIterator[dict]
+        :return: list
+
+        """
+
+        return [record async for record in records]
+
+    async def iter_fetch(  # pylint:disable=too-many-arguments,too-many-locals
+        self,
+        method: str,
+        endpoint: str = None,
+        params: dict = None,
+        pages: bool = False,
+        identity_map: IdentityMap = None,
+        raw: bool = False,
+        models: bool = False,
+        parallel: int = None,
+        partitions: list | bool = None,
+        dedupe: bool = False,
+        prefetch: int = None,
+        max_items: int = None,
+        take_while: Callable[[dict], bool] = None,
+        checkpoint: Checkpoint = None,
+    ) -> AsyncIterator[dict | bytes | Resource]:
+        """Async generator counterpart of ``fetch``.
+
+        :param method: str
+        :param endpoint: str
+        :param params: dict
+        :param pages: bool
+        :param identity_map: IdentityMap
+        :param raw: bool
+        :param models: bool
+        :param parallel: int
+        :param partitions: list of dict or True
+        :param dedupe: bool
+        :param prefetch: int
+        :param max_items: int
+        :param take_while: callable
+        :param checkpoint: Checkpoint
+        :return: AsyncIterator[dict | bytes | Resource]
+        :raises: NotImplementedError: Not implemented.
+        :exception Exception: Broad exception.
+
+        """
+
+        url = f"https://{self.server_instance}.adobe.com/primeapi/v2/{endpoint}"
+        if identity_map is None:
+            identity_map = self.identity_map
+
+        try:
+            if method in ("get", "GET") and raw:
+                async for content in aiter_documents(
+                    self,
+                    url=url,
+                    params=params,
+                    raw=True,
+                    parallel=parallel,
+                    partitions=partitions,
+                    prefetch=prefetch,
+                    checkpoint=checkpoint,
+                ):
+                    yield content
+            elif method in ("get", "GET"):
+                async for r_json in aiter_documents(
+                    self,
+                    url=url,
+                    params=params,
+                    parallel=parallel,
+                    partitions=partitions,
+                    dedupe=dedupe,
+                    prefetch=prefetch,
+                    max_items=max_items,
+                    take_while=take_while,
+                    checkpoint=checkpoint,
+                ):
+                    for record in page_records(r_json, pages, models, identity_map):
+                        yield record
+            else:
+                raise NotImplementedError(
+                    f"{method.upper()} method is not yet implemented."
+                )
+        except Exception as e:
+            logging.error("%s: %s", str(e), url)
+            raise Exception from e  # pylint:disable=broad-exception-raised
+
+    async def iter_pages(  # pylint:disable=too-many-branches,too-many-statements
+        self,
+        url: str,
+        params: dict = None,
+        raw: bool = False,
+        adaptive: bool = True,
+        max_size: int = None,
+    ) -> AsyncIterator[dict | bytes]:
+        """Yield the JSON document of every page, following ``links.next``
+        until the last page. Documents are decoded with ``self.json_loads``
+        only once the status is known; with ``raw`` the undecoded body is
+        yielded instead. Without ``adaptive`` the page size is left as given
+        rather than set by ``self.paging``; a size the API rejects still
+        lowers the policy's size, but the page is not requested again.
+        ``max_size`` caps the policy's size, e.g. for a scan stopping after
+        fewer records; such pages neither adapt nor shrink the policy's size.
+
+        :param url: str
+        :param params: dict
+        :param raw: bool
+        :param adaptive: bool
+        :param max_size: int
+        :return: AsyncIterator[dict | bytes]
+        :raises RuntimeError: a page kept failing with a retryable status.
+        :raises asyncio.TimeoutError: a page timed out and its size cannot shrink any
+            further, or no paging size is in effect.
+
+        """
+
+        while url:
+            logging.debug(url)
+            await self.ensure_access_token()
+            access_token = self.access_token
+            size = None
+            if self.paging is not None and adaptive:
+                url, params, size = self.paging.apply(
+                    url=url, params=params, max_size=max_size
+                )
+            adapting = size is not None and size != max_size
+            shrinkable = adapting and self.paging.can_shrink(size)
+            started = time.monotonic()
+            try:
+                r = await self.get_page(
+                    url=url, params=params, retry_timeouts=not shrinkable
+                )
+            except asyncio.TimeoutError:
+                if not shrinkable or not self.paging.shrink(url=url, size=size):
+                    raise
+                continue
+            if adapting and r.status_code == 200:
+                if not isinstance(r, CachedResponse):
+                    self.paging.observe(
+                        url=url,
+                        size=size,
+                        elapsed=time.monotonic() - started,
+                        nbytes=len(r.content),
+                    )
+            if r.status_code == 400:
+                r_json = self.json_loads(r.content)
+                requested = size or page_limit(url, params)
+                if requested and self.paging is not None:
+                    if self.paging.reject(url, requested, r_json) and adaptive:
+                        continue
+
+            if r.status_code == 200 and raw:
+                yield r.content
+                url = next_link(r.content, self.json_loads)
+                params = {}
+            elif r.status_code == 200:
+                r_json = self.json_loads(r.content)
+                if "data" in r_json:
+                    if isinstance(r, CachedResponse):
+                        r_json.setdefault("meta", {})["age"] = r.age
+                    yield r_json
+                    try:
+                        url = r_json["links"]["next"]
+                        params = {}
+                    except KeyError:
+                        url = None
+                else:
+                    logging.debug("Response has no data: %s", url)
+                    url = None
+            elif r.status_code == 400:
+                self._log_api_error(r.status_code, r_json)
+                url = None
+            elif r.status_code == 401:
+                self._log_api_error(r.status_code, self.json_loads(r.content))
+                if access_token == self.access_token:
+                    self.expires_on = None
+                    if not await self.check_access_token():
+                        url = None
+                else:
+                    logging.debug('"access_token" was refreshed meanwhile: %s', url)
+            elif self.retry.is_retryable("GET", r.status_code):
+                raise RuntimeError(
+                    f"{r.status_code} {r.reason} after "
+                    f"{self.retry.max_attempts} attempts: {url}"
+                )
+            else:
+                logging.error("%s %s", r.status_code, r.reason)
+                url = None
+
+    async def get_page(
+        self, url: str, params: dict = None, retry_timeouts: bool = True
+    ) -> AsyncResponse | CachedResponse:
+        """GET one page. With ``self.coalesce`` concurrent calls for the same
+        URL and parameters share a single request and its response. A
+        cancelled call only stops waiting; the shared request is cancelled
+        once no call waits for it any more.
+
+        :param url: str
+        :param params: dict
+        :param retry_timeouts: bool, see ``request``
+        :return: AsyncResponse or CachedResponse
+
+        """
+
+        if not self.coalesce:
+            return await self.get_cached_page(
+                url=url, params=params, retry_timeouts=retry_timeouts
+            )
+
+        key = canonical_url(url, params)
+        if (shared := self.in_flight.get(key)) is None:
+            shared = self.in_flight[key] = SharedRequest(
+                asyncio.create_task(
+                    self.get_cached_page(
+                        url=url, params=params, retry_timeouts=retry_timeouts
+                    )
+                )
+            )
+            shared.task.add_done_callback(lambda _: self.forget_request(key, shared))
+        else:
+            logging.debug("Coalesced with in-flight request: %s", key)
+
+        # The request runs as its own task, so a caller being cancelled only
+        # cancels its wait; the request is cancelled with its last waiter.
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not shared.task.done():
+                shared.task.cancel()
+                self.forget_request(key, shared)
+
+    def forget_request(self, key: str, shared: SharedRequest) -> None:
+        """Stop coalescing calls into ``shared`` once it is done or cancelled.
+
+        :param key: str
+        :param shared: SharedRequest
+
+        """
+
+        if self.in_flight.get(key) is shared:
+            del self.in_flight[key]
+
+    async def get_cached_page(
+        self, url: str, params: dict = None, retry_timeouts: bool = True
+    ) -> AsyncResponse | CachedResponse:
+        """GET one page, served from ``self.cache`` while the cached copy is
+        fresh. A stale copy is revalidated with ``If-None-Match`` and
+        ``If-Modified-Since``, and a 304 answer is served from the cached body.
+        Within the cache's ``stale_while_revalidate`` window the stale copy is
+        returned at once and revalidated by a background task.
+
+        :param url: str
+        :param params: dict
+        :param retry_timeouts: bool, see ``request``
+        :return: AsyncResponse or CachedResponse
+
+        """
+
+        if (ttl := self.cache.ttl_for(url) if self.cache is not None else 0) <= 0:
+            return await self.request(
+                "GET",
+                url=url,
+                params=params,
+                headers=self.headers,
+                retry_timeouts=retry_timeouts,
+            )
+
+        key = self.cache.key(url, params, identity=self.cache_identity)
+        entry = await run_blocking(self.cache.get, key, blocking=self.cache.blocking)
+        if entry is not None and entry.fresh:
+            logging.debug("Cache hit: %s", key)
+            return CachedResponse(entry)
+        if entry is not None and self.cache.serves_stale(entry):
+            logging.debug("Cache stale hit: %s", key)
+            if self.cache.begin_refresh(key):
+                task = asyncio.create_task(
+                    self._refresh_page(url, params, key, ttl, entry)
+                )
+                self.background_tasks.add(task)
+                task.add_done_callback(self.background_tasks.discard)
+            return CachedResponse(entry)
+
+        return await self._fetch_page(
+            url, params, key, ttl, entry, retry_timeouts=retry_timeouts
+        )
+
+    async def _fetch_page(  # pylint:disable=too-many-arguments
+        self,
+        url: str,
+        params: dict,
+        key: str,
+        ttl: float,
+        entry: CacheEntry | None,
+        retry_timeouts: bool = True,
+    ) -> AsyncResponse | CachedResponse:
+        """GET a cacheable page, conditionally when a stale entry exists.
+
+        :param url: str
+        :param params: dict
+        :param key: str
+        :param ttl: float
+        :param entry: the stale entry, if any
+        :param retry_timeouts: bool, see ``request``
+        :return: AsyncResponse or CachedResponse
+
+        """
+
+        headers = self.headers
+        if entry is not None:
+            headers.update(entry.validators)
+        r = await self.request(
+            "GET",
+            url=url,
+            params=params,
+            headers=headers,
+            retry_timeouts=retry_timeouts,
+        )
+
+        return await run_blocking(
+            self._cache_page, key, ttl, entry, r, blocking=self.cache.blocking
+        )
+
+    async def _refresh_page(  # pylint:disable=too-many-arguments
+        self, url: str, params: dict, key: str, ttl: float, entry: CacheEntry
+    ) -> None:
+        """Revalidate a stale page in the background.
+
+        :param url: str
+        :param params: dict
+        :param key: str
+        :param ttl: float
+        :param entry: CacheEntry
+
+        """
+
+        try:
+            await self.ensure_access_token()
+            await self._fetch_page(url, params, key, ttl, entry)
+        except Exception as e:  # pylint:disable=broad-except
+            logging.warning("Background refresh failed: %s: %s", str(e), url)
+        finally:
+            self.cache.end_refresh(key)
+
+    async def request(
+        self, method: str, url: str, retry_timeouts: bool = True, **kwargs
+    ) -> AsyncResponse:
+        """Send a request through the pooled session after taking a token from
+        ``self.rate_limiter`` (on a worker thread when it is a blocking one,
+        such as ``SQLiteTokenBucket``), repeating throttled and transient
+        failures according to ``self.retry``. Without ``retry_timeouts`` a
+        timeout is raised at once, so ``iter_pages`` can shrink the page size
+        instead of asking for the same page again.
+
+        :param method: str
+        :param url: str
+        :param retry_timeouts: bool
+        :param kwargs: forwarded to ``aiohttp.ClientSession.request``
+        :return: AsyncResponse
+        :raises aiohttp.ClientError: connection failed on every attempt.
+        :raises asyncio.TimeoutError: request timed out on every attempt, or
+            once without ``retry_timeouts``.
+
+        """
+
+        import aiohttp
+
+        if "params" in kwargs:
+            kwargs["params"] = normalize_params(kwargs["params"])
+        if self.paging is not None and self.paging.timeout:
+            kwargs.setdefault(
+                "timeout", aiohttp.ClientTimeout(total=self.paging.timeout)
+            )
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                if self.rate_limiter.blocking:
+                    delay = await asyncio.get_running_loop().run_in_executor(
+                        None, self.rate_limiter.reserve
+                    )
+                else:
+                    delay = self.rate_limiter.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+            try:
+                async with self.get_session().request(method, url, **kwargs) as r:
+                    response = AsyncResponse(
+                        status_code=r.status,
+                        reason=r.reason,
+                        headers=r.headers,
+                        content=await r.read(),
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if (
+                    attempt >= self.retry.max_attempts
+                    or not self.retry.is_retryable(method)
+                    or (isinstance(e, asyncio.TimeoutError) and not retry_timeouts)
+                ):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logging.warning(
+                    "%s, retrying %s in %.2fs (attempt %s of %s)",
+                    e,
+                    url,
+                    delay,
+                    attempt,
+                    self.retry.max_attempts,
+                )
+            else:
+                if attempt >= self.retry.max_attempts or not self.retry.is_retryable(
+                    method, response.status_code
+                ):
+                    return response
+                delay = self.retry.backoff(attempt, response.headers.get("Retry-After"))
+                logging.warning(
+                    "%s %s, retrying %s in %.2fs (attempt %s of %s)",
+                    response.status_code,
+                    response.reason,
+                    url,
+                    delay,
+                    attempt,
+                    self.retry.max_attempts,
+                )
+            await asyncio.sleep(delay)
+
+    async def ensure_access_token(self) -> None:
+        """Refresh the access token ahead of time when it expires within
+        ``refresh_margin`` seconds, keeping the current token until it expires
+        when the refresh fails.
+
+        :raises RuntimeError: the token expired and could not be refreshed.
+
+        """
+
+        if not self.refresh_due():
+            return
+
+        if self.expires_on is not None:
+            try:
+                await self.refresh_access_token()
+            except Exception as e:  # pylint:disable=broad-except
+                self.defer_refresh(e)
+        elif not self.token_checked:
+            await self.check_access_token()
+
+    async def check_access_token(self):
+        """Checks in access token and check if it is expired or not.
+
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        if self.token_is_valid():
+            return True
+
+        self.token_checked = True
+
+        params = {
+            "access_token": self.access_token,
+        }
+
+        url = f"https://{self.server_instance}.adobe.com/oauth/token/check"
+
+        r = await self.request("GET", url=url, params=params)
+
+        if r.status_code == 200:
+            r_json = r.json()
+            if "error" in r_json:
+                logging.error("Error: %s", r_json["error"])
+                logging.info(
+                    '"access_token" has been expired and '
+                    "automatic process will try to refresh it..."
+                )
+                return await self.refresh_access_token()
+
+            if "expires_in" in r_json:
+                self._store_token_check(r_json, flush=False)
+                await run_blocking(self.store.flush, blocking=self.store.blocking)
+                return True
+        else:
+            logging.error("%s %s", r.status_code, r.reason)
+            return False
+
+    async def refresh_access_token(self):
+        """Retrieve new access token with given refresh token.
+
+        :return: True
+        :rtype: Boolean
+        :raises RuntimeError: Failed authorization or unexpected error while refreshing.
+
+        """
+
+        stale_token = self.access_token
+        lock = self.store.lock()
+        async with refresh_lock(lock):
+            while not lock.acquire(blocking=False):
+                await asyncio.sleep(0.05)
+            try:
+                if self.access_token == stale_token:
+                    await run_blocking(self.store.read, blocking=self.store.blocking)
+                if self.reload_access_token(stale_token=stale_token, reload=False):
+                    return True
+
+                return await self._refresh_access_token()
+            finally:
+                lock.release()
+
+    async def _refresh_access_token(self):
+        """Call ``/oauth/token/refresh``; see ``refresh_access_token``.
+
+        :return: True
+        :rtype: Boolean
+
+        """
+
+        url = f"https://{self.server_instance}.adobe.com/oauth/token/refresh"
+
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+        params = {
+            "client_id": self.application_id,
+            "client_secret": self.application_secret,
+            "refresh_token": self.refresh_token,
+        }
+
+        r = await self.request("POST", url=url, headers=headers, params=params)
+
+        self._store_token_refresh(
+            status_code=r.status_code, reason=r.reason, r_json=r.json(), flush=False
+        )
+        if self.store.dirty:
+            # The event loop thread holds the store's lock already.
+            await run_blocking(self.store.write, blocking=self.store.blocking)
+
+        return True
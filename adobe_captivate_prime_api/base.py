@@ -0,0 +1,478 @@
+"""This module provides ``BaseCaptivatePrimeAPI``, the configuration and
+token bookkeeping shared by ``CaptivatePrimeAPI`` and
+``AsyncCaptivatePrimeAPI``, and ``run_blocking`` which keeps the blocking I/O
+of stores, caches and checkpoints off the event loop."""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+from .cache import (
+    CachedResponse,
+    CacheEntry,
+    ResponseCache,
+)
+from .codec import (
+    loads,
+    next_link,
+)
+from .identity_map import IdentityMap
+from .paging import PagingPolicy
+from .rate_limit import TokenBucket
+from .retry import RetryPolicy
+from .store import (
+    ConfigFileStore,
+    CredentialStore,
+)
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+async def run_blocking(function: Callable, *args, blocking: bool = True):
+    """Call ``function`` with ``args``, on a worker thread of the running
+    event loop when ``blocking``, such as the methods of a ``SQLiteCache``.
+
+    :param function: callable
+    :param args: positional arguments of ``function``
+    :param blocking: bool, the ``blocking`` flag of the object called
+    :return: the result of ``function``
+    :rtype: object
+
+    """
+
+    if not blocking:
+        return function(*args)
+
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+class BaseCaptivatePrimeAPI:  # pylint:disable=too-many-instance-attributes
+    """BaseCaptivatePrimeAPI Class.
+
+    All state (settings, tokens, expiry, store) belongs to the instance, so
+    several accounts can be served from one process; ``config_file`` below is
+    only the default path of the ``ConfigFileStore``. Subclasses provide the
+    HTTP layer, synchronous or asynchronous, through ``init_session`` and
+    their request methods.
+
+    """
+
+    config_file = "config.cfg"
+    default_server_instance = "captivateprime"
+    refresh_retry_interval = 60.0
+
+    def __init__(  # pylint:disable=too-many-arguments,too-many-locals
+        self,
+        server_instance=None,
+        application_id=None,
+        application_secret=None,
+        application_url=None,
+        application_scopes=None,
+        access_token=None,
+        refresh_token=None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry: RetryPolicy = None,
+        rate_limiter: TokenBucket = None,
+        refresh_margin: float = 300.0,
+        store: CredentialStore = None,
+        config_file: str = None,
+        session=None,
+        identity_map: IdentityMap = None,
+        cache: ResponseCache = None,
+        coalesce: bool = True,
+        json_loads: Callable = None,
+        paging: PagingPolicy = None,
+    ):
+
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.refresh_margin = refresh_margin
+        self.token_checked = False
+        self.refresh_retry_at = 0.0
+        self.identity_map = identity_map
+        self.cache = cache
+        self.coalesce = coalesce
+        self.json_loads = json_loads or loads
+        self.paging = paging
+        self.in_flight = {}
+        self.in_flight_lock = threading.Lock()
+        self.owns_session = session is None
+        self.init_session(
+            session=session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+        )
+
+        self.config_file = config_file or self.config_file
+        self.store = store if store is not None else ConfigFileStore(self.config_file)
+
+        arguments = {
+            "server_instance": server_instance,
+            "application_id": application_id,
+            "application_secret": application_secret,
+            "application_url": application_url,
+            "application_scopes": application_scopes,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+        }
+        for option, value in arguments.items():
+            if value:
+                self.store.set(section="CAPTIVATE", option=option, value=value)
+        self.store.flush()
+
+        self.server_instance = (
+            self.store.get("CAPTIVATE", "server_instance")
+            or self.default_server_instance
+        )
+        self.application_id = self.store.get("CAPTIVATE", "application_id")
+        self.application_secret = self.store.get("CAPTIVATE", "application_secret")
+        self.application_url = self.store.get("CAPTIVATE", "application_url")
+        self.application_scopes = self.store.get("CAPTIVATE", "application_scopes")
+        self.access_token = self.store.get("CAPTIVATE", "access_token")
+        self.refresh_token = self.store.get("CAPTIVATE", "refresh_token")
+
+        self.expires_on = None
+        if not access_token and self.store.get("APP", "expires_on"):
+            self.expires_on = float(self.store.get("APP", "expires_on"))
+
+    def init_session(  # pylint:disable=too-many-arguments
+        self,
+        session=None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        """Set up the HTTP session of the client: ``session`` when given, a
+        new pooled one otherwise.
+
+        :param session: HTTP session shared with other clients, or None
+        :type session: requests.Session or aiohttp.ClientSession
+        :param pool_connections: int
+        :param pool_maxsize: int
+        :param pool_block: bool
+        :param keep_alive: bool
+        :raises NotImplementedError: implemented by the clients.
+
+        """
+
+        raise NotImplementedError
+
+    def is_last_page(self, page: dict | bytes, limit: int) -> bool:
+        """Whether a page ends its scan.
+
+        :param page: dict or bytes
+        :param limit: int, page size that was requested
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        if isinstance(page, bytes):
+            return next_link(page, self.json_loads) is None
+
+        data = page.get("data")
+
+        return (
+            not isinstance(data, list)
+            or len(data) < limit
+            or "next" not in page.get("links", {})
+        )
+
+    def _cache_page(self, key: str, ttl: float, entry: CacheEntry | None, r):
+        """Store the response of a cacheable page.
+
+        :param key: str
+        :param ttl: float
+        :param entry: the stale entry that was revalidated, if any
+        :param r: requests.Response or AsyncResponse
+        :return: the response, or a CachedResponse for a 304
+
+        """
+
+        if r.status_code == 304 and entry is not None:
+            logging.debug("Cache revalidated: %s", key)
+            entry = entry.revalidated(r, ttl)
+            self.cache.set(key, entry, revalidated=True)
+            return CachedResponse(entry)
+        if r.status_code == 200:
+            self.cache.set(key, CacheEntry.from_response(r, ttl))
+
+        return r
+
+    @property
+    def cache_identity(self) -> str:
+        """Identity of the client in cache keys: the account and user reported
+        by ``/oauth/token/check``, or a hash of ``application_id`` until the
+        token has been checked.
+
+        :return: str
+
+        """
+
+        account_id = self.store.get("APP", "account_id")
+        user_id = self.store.get("APP", "user_id")
+        if account_id and user_id:
+            return f"{account_id}:{user_id}"
+
+        digest = hashlib.sha256((self.application_id or "").encode()).hexdigest()
+
+        return f"app:{digest[:16]}"
+
+    @staticmethod
+    def _log_api_error(status_code: int, r_json: dict) -> None:
+        """Log a JSON:API error document returned with a 400 or 401 status.
+
+        :param status_code: int
+        :param r_json: dict
+
+        """
+
+        logging.error(
+            "%s %s - %s: %s",
+            status_code,
+            r_json["status"],
+            r_json["title"],
+            r_json["source"]["info"],
+        )
+        if status_code == 401:
+            logging.info(
+                "A generic http unauthorized access error. "
+                "Access is denied due to invalid credentials. "
+                "Automatic process will try to refresh it..."
+            )
+
+    @property
+    def headers(self) -> dict:
+        """Request headers carrying the current access token.
+
+        :return: dict
+
+        """
+
+        return {
+            "Accept": "application/vnd.api+json",
+            "Authorization": f"oauth {self.access_token}",
+        }
+
+    @staticmethod
+    def create_tokens():
+        """Captivate Prime APIs use OAuth 2.0 framework to authenticate and
+        authorize your client applications.
+
+        :raise NotImplementedError: Not implemented.
+
+        """
+
+        logging.error(
+            "Captivate Prime APIs use OAuth 2.0 framework to "
+            "authenticate and authorize the application. Due to limitations "
+            "it is only possible to authenticate with login, manually."
+        )
+
+        raise NotImplementedError("Authenticate manually and set tokens in config.cfg")
+
+    def token_is_valid(self) -> bool:
+        """Whether the access token is known to stay valid for at least
+        ``refresh_margin`` seconds, based on the locally tracked expiry.
+
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        return (
+            self.expires_on is not None
+            and time.time() < self.expires_on - self.refresh_margin
+        )
+
+    def refresh_due(self) -> bool:
+        """Whether ``ensure_access_token`` should refresh the access token
+        now: it expires within ``refresh_margin`` seconds and no failed
+        refresh is waiting for ``refresh_retry_interval`` to pass.
+
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        if self.token_is_valid():
+            return False
+
+        return self.expires_on is None or time.time() >= min(
+            self.refresh_retry_at, self.expires_on
+        )
+
+    def defer_refresh(self, error: Exception) -> None:
+        """Keep the current access token after a failed refresh ahead of time,
+        as long as it has not expired; the refresh is tried again after
+        ``refresh_retry_interval`` seconds.
+
+        :param error: Exception, the failure of the refresh
+        :raises Exception: ``error``, once the access token has expired.
+
+        """
+
+        now = time.time()
+        if self.expires_on is None or now >= self.expires_on:
+            raise error
+
+        self.refresh_retry_at = min(self.expires_on, now + self.refresh_retry_interval)
+        logging.warning(
+            '"access_token" could not be refreshed ahead of time (%s), using it '
+            "until it expires on %s",
+            error,
+            datetime.fromtimestamp(self.expires_on).isoformat(),
+        )
+
+    def reload_access_token(self, stale_token: str, reload: bool = True) -> bool:
+        """Pick up a token refreshed by another thread or process.
+
+        Refreshes are single-flight: they run under the lock of the store,
+        and whoever waited for the lock first checks here whether the token it
+        wanted to replace has been replaced already, instead of rotating the
+        ``refresh_token`` once more.
+
+        :param stale_token: str, the access token that was seen to be expired
+        :param reload: bool, re-read the store first; without it the caller
+            has done so already
+        :return: True/False, whether a newer token is in use now
+        :rtype: Boolean
+
+        """
+
+        if self.access_token != stale_token:
+            return True
+
+        if reload:
+            self.store.reload()
+        access_token = self.store.get("CAPTIVATE", "access_token")
+        expires_on = self.store.get("APP", "expires_on")
+        if (
+            access_token != stale_token
+            and expires_on
+            and float(expires_on) > time.time()
+        ):
+            self.access_token = access_token
+            self.refresh_token = self.store.get("CAPTIVATE", "refresh_token")
+            self.expires_on = float(expires_on)
+            logging.info('"access_token" has been refreshed by another process')
+            return True
+
+        return False
+
+    def _store_token_check(self, r_json: dict, flush: bool = True) -> bool:
+        """Store the result of a successful ``/oauth/token/check`` call.
+
+        :param r_json: dict
+        :param flush: bool, write the store; without it the caller does
+        :return: True
+        :rtype: Boolean
+
+        """
+
+        checked_at = time.time()
+        expires_on = checked_at + r_json["expires_in"]
+        self.expires_on = expires_on
+        expires_on_human = datetime.fromtimestamp(expires_on).isoformat()
+        logging.info('"access_token" will be valid until %s', expires_on_human)
+
+        self.store.update(
+            section="APP",
+            values={
+                "account_id": r_json["account_id"],
+                "user_id": r_json["user_id"],
+                "user_role": r_json["user_role"],
+                "checked_at": checked_at,
+                "expires_on": expires_on,
+            },
+        )
+        if flush:
+            self.store.flush()
+
+        return True
+
+    def _store_token_refresh(
+        self, status_code: int, reason: str, r_json: dict, flush: bool = True
+    ) -> bool:
+        """Store the tokens returned by ``/oauth/token/refresh``.
+
+        :param status_code: int
+        :param reason: str
+        :param r_json: dict
+        :param flush: bool, write the store; without it the caller does
+        :return: True
+        :rtype: Boolean
+        :raises RuntimeError: Failed authorization or unexpected error while refreshing.
+
+        """
+
+        if status_code == 200:
+            access_token = r_json["access_token"]
+            refresh_token = r_json["refresh_token"]
+            refreshed_at = time.time()
+            self.expires_on = refreshed_at + r_json["expires_in"]
+
+            self.store.set(section="APP", option="checked_at", value=refreshed_at)
+
+            if access_token != self.access_token:
+                self.access_token = access_token
+                self.refresh_token = refresh_token
+                self.store.update(
+                    section="CAPTIVATE",
+                    values={
+                        "access_token": access_token,
+                        "refresh_token": refresh_token,
+                    },
+                )
+                self.store.update(
+                    section="APP",
+                    values={
+                        "refreshed_at": refreshed_at,
+                        "expires_on": self.expires_on,
+                    },
+                )
+
+                logging.info(
+                    '"access_token" has been refreshed and will be valid until %s',
+                    datetime.fromtimestamp(self.expires_on).isoformat(),
+                )
+
+            if flush:
+                self.store.flush()
+            return True
+        elif status_code == 400:
+            logging.error(
+                "%s %s - %s: %s",
+                status_code,
+                r_json["status"],
+                r_json["title"],
+                r_json["source"]["info"],
+            )
+            raise RuntimeError(
+                f"{status_code} {r_json['status']} - "
+                f"{r_json['title']}: {r_json['source']['info']}"
+            )
+        else:
+            logging.error("%s %s", status_code, reason)
+            raise RuntimeError(
+                f"Unexpected error: {status_code} {reason} while refreshing token!",
+            )
+
+    def write_config(self) -> None:
+        """Write pending configuration changes through the credential store.
+
+        :raise RuntimeError: error while writing to the config file.
+
+        """
+
+        self.store.flush()
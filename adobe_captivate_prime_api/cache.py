@@ -0,0 +1,547 @@
+"""This module provides the response caches ``CaptivatePrimeAPI.fetch`` can
+serve read-mostly GET pages from."""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from .codec import loads
+from .params import canonical_url
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def endpoint_of(url: str) -> str:
+    """Return the API endpoint of a URL, e.g. ``learningObjects/course:1``.
+
+    :param url: str
+    :return: str
+
+    """
+
+    path = urlsplit(url).path
+
+    return path.split("/primeapi/v2/", 1)[-1].strip("/")
+
+
+class CacheEntry:
+    """CacheEntry Class.
+
+    Raw body of one cached page with its storage time, time to live and the
+    ``ETag``/``Last-Modified`` validators used to revalidate it.
+
+    """
+
+    __slots__ = ("content", "stored_at", "ttl", "etag", "last_modified")
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        content: bytes,
+        ttl: float,
+        stored_at: float = None,
+        etag: str = None,
+        last_modified: str = None,
+    ):
+        self.content = content
+        self.ttl = ttl
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def from_response(cls, r, ttl: float) -> "CacheEntry":
+        """Build an entry from a 200 response, keeping its validators.
+
+        :param r: requests.Response or AsyncResponse
+        :type r: requests.Response or AsyncResponse
+        :param ttl: float
+        :return: CacheEntry
+
+        """
+
+        return cls(
+            content=r.content,
+            ttl=ttl,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+        )
+
+    def revalidated(self, r, ttl: float) -> "CacheEntry":
+        """Return a fresh copy of the entry after a 304 response; validators
+        sent along with the 304 replace the stored ones.
+
+        :param r: requests.Response or AsyncResponse
+        :type r: requests.Response or AsyncResponse
+        :param ttl: float
+        :return: CacheEntry
+
+        """
+
+        return CacheEntry(
+            content=self.content,
+            ttl=ttl,
+            etag=r.headers.get("ETag") or self.etag,
+            last_modified=r.headers.get("Last-Modified") or self.last_modified,
+        )
+
+    @property
+    def validators(self) -> dict:
+        """Conditional request headers revalidating the entry.
+
+        :return: dict
+
+        """
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was stored or last revalidated.
+
+        :return: float
+
+        """
+
+        return max(0.0, time.time() - self.stored_at)
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is still within its time to live.
+
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        return self.age < self.ttl
+
+
+class CachedResponse:
+    """Response served from a ``CacheEntry``, exposing the parts of the
+    ``requests.Response`` interface the client relies on."""
+
+    status_code = 200
+    reason = "OK (cached)"
+
+    def __init__(self, entry: CacheEntry):
+        self.entry = entry
+        self.content = entry.content
+        self.age = entry.age
+        self.headers = {"Age": str(int(self.age))}
+
+    def json(self) -> dict:
+        """Decode the body as JSON.
+
+        :return: dict
+
+        """
+
+        return loads(self.content)
+
+
+class ResponseCache:  # pylint:disable=too-many-instance-attributes
+    """ResponseCache Class.
+
+    In-memory LRU cache of GET pages with a time to live per endpoint. Keys
+    are the canonical URL (query parameters normalised and sorted) prefixed
+    with ``namespace`` and the identity of the client, so clients of other
+    accounts or users sharing the cache never see each other's pages. An
+    endpoint is only cached when ``ttls`` has an entry for its
+    first path segment (e.g. ``catalogs`` covers ``catalogs/123``) or
+    ``default_ttl`` is positive.
+
+    Subclasses such as ``SQLiteCache`` replace ``load``, ``store``,
+    ``discard`` and ``keys`` to keep entries elsewhere, and set ``blocking``
+    when these do I/O, so that ``AsyncCaptivatePrimeAPI`` calls ``get`` and
+    ``set`` on a worker thread.
+
+    """
+
+    blocking = False
+
+    default_ttls = {
+        "account": 3600,
+        "badges": 3600,
+        "catalogs": 3600,
+        "learningObjects": 900,
+        "skills": 3600,
+        "userGroups": 900,
+    }
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        maxsize: int = 1024,
+        ttls: dict = None,
+        default_ttl: float = 0,
+        namespace: str = "",
+        stale_while_revalidate: float = 0,
+    ):
+        self.maxsize = maxsize
+        self.ttls = dict(self.default_ttls if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.stale_while_revalidate = stale_while_revalidate
+        self.entries = OrderedDict()
+        self.refreshing = set()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.revalidations = 0
+
+    def key(self, url: str, params: dict = None, identity: str = "") -> str:
+        """Canonical cache key of a request.
+
+        :param url: str
+        :param params: dict
+        :param identity: str, account and user the page was fetched for
+        :return: str
+
+        """
+
+        prefix = f"{self.namespace}{identity} " if identity else self.namespace
+
+        return f"{prefix}{canonical_url(url, params)}"
+
+    def ttl_for(self, url: str) -> float:
+        """Time to live of the endpoint of ``url``; 0 disables caching.
+
+        :param url: str
+        :return: float
+
+        """
+
+        resource = endpoint_of(url).split("/", 1)[0]
+
+        return self.ttls.get(resource, self.default_ttl)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry of ``key``, fresh or not, and count a hit when it
+        is fresh, a stale hit when it may be served stale or a miss otherwise.
+
+        :param key: str
+        :return: CacheEntry or None
+
+        """
+
+        entry = self.load(key)
+        with self.lock:
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            elif entry is not None and self.serves_stale(entry):
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+
+        return entry
+
+    def serves_stale(self, entry: CacheEntry) -> bool:
+        """Whether an expired entry may still be served while it is refreshed.
+
+        :param entry: CacheEntry
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        return entry.age < entry.ttl + self.stale_while_revalidate
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh of ``key``.
+
+        :param key: str
+        :return: True/False, False when a refresh is already running
+        :rtype: Boolean
+
+        """
+
+        with self.lock:
+            if key in self.refreshing:
+                return False
+            self.refreshing.add(key)
+
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        """Release the background refresh of ``key``.
+
+        :param key: str
+
+        """
+
+        with self.lock:
+            self.refreshing.discard(key)
+
+    def set(self, key: str, entry: CacheEntry, revalidated: bool = False) -> None:
+        """Store an entry.
+
+        :param key: str
+        :param entry: CacheEntry
+        :param revalidated: bool, whether a stale entry was confirmed by a 304
+
+        """
+
+        if revalidated:
+            with self.lock:
+                self.revalidations += 1
+        self.store(key, entry)
+
+    def invalidate(self, endpoint: str = None) -> None:
+        """Drop the entries of ``endpoint`` and everything below it, e.g.
+        ``catalogs`` or ``learningObjects/course:1``; all entries when no
+        endpoint is given.
+
+        :param endpoint: str
+
+        """
+
+        endpoint = (endpoint or "").strip("/")
+        for key in self.keys():
+            current = endpoint_of(key.split("?", 1)[0])
+            if (
+                not endpoint
+                or current == endpoint
+                or current.startswith(f"{endpoint}/")
+            ):
+                self.discard(key)
+
+    def stats(self) -> dict:
+        """Return hit, stale hit, miss and revalidation counters and the
+        number of entries.
+
+        :return: dict
+
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "revalidations": self.revalidations,
+            "size": len(self.keys()),
+        }
+
+    def load(self, key: str) -> CacheEntry | None:
+        """Read an entry from the backend.
+
+        :param key: str
+        :return: CacheEntry or None
+
+        """
+
+        with self.lock:
+            if (entry := self.entries.get(key)) is not None:
+                self.entries.move_to_end(key)
+
+            return entry
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """Write an entry to the backend, evicting the least recently used
+        entries above ``maxsize``.
+
+        :param key: str
+        :param entry: CacheEntry
+
+        """
+
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the backend.
+
+        :param key: str
+
+        """
+
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def keys(self) -> list:
+        """Return every key of the backend.
+
+        :return: list
+
+        """
+
+        with self.lock:
+            return list(self.entries)
+
+
+class SQLiteCache(ResponseCache):
+    """SQLiteCache Class.
+
+    Response cache kept in a SQLite database in WAL mode, so that successive
+    runs and every process on the host pointing to the same ``path`` reuse
+    each other's pages. Besides ``maxsize`` entries, the bodies are capped at
+    ``max_bytes`` in total; expired entries are evicted first, then the least
+    recently used ones.
+
+    """
+
+    blocking = True
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        path: str,
+        maxsize: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: dict = None,
+        default_ttl: float = 0,
+        namespace: str = "",
+        stale_while_revalidate: float = 0,
+        timeout: float = 30.0,
+    ):
+        super().__init__(
+            maxsize=maxsize,
+            ttls=ttls,
+            default_ttl=default_ttl,
+            namespace=namespace,
+            stale_while_revalidate=stale_while_revalidate,
+        )
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.local = threading.local()
+
+        connection = self.connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache (key TEXT PRIMARY KEY, "
+            "content BLOB, stored_at REAL, ttl REAL, accessed_at REAL, size INTEGER, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        columns = [
+            row[1] for row in connection.execute("PRAGMA table_info(http_cache)")
+        ]
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                connection.execute(f"ALTER TABLE http_cache ADD COLUMN {column} TEXT")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS http_cache_accessed_at "
+            "ON http_cache (accessed_at)"
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the cache database.
+
+        :return: sqlite3.Connection
+
+        """
+
+        if (connection := getattr(self.local, "connection", None)) is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+
+        return connection
+
+    def load(self, key: str) -> CacheEntry | None:
+        """Read an entry and mark it as recently used.
+
+        :param key: str
+        :return: CacheEntry or None
+
+        """
+
+        connection = self.connect()
+        row = connection.execute(
+            "SELECT content, stored_at, ttl, etag, last_modified FROM http_cache "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        connection.execute(
+            "UPDATE http_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        content, stored_at, ttl, etag, last_modified = row
+
+        return CacheEntry(
+            content=bytes(content),
+            ttl=ttl,
+            stored_at=stored_at,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """Write an entry, then evict entries above ``maxsize`` or
+        ``max_bytes``.
+
+        :param key: str
+        :param entry: CacheEntry
+
+        """
+
+        now = time.time()
+        connection = self.connect()
+        connection.execute("BEGIN IMMEDIATE")
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(key, content, stored_at, ttl, accessed_at, size, etag, "
+                "last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.content,
+                    entry.stored_at,
+                    entry.ttl,
+                    now,
+                    len(entry.content),
+                    entry.etag,
+                    entry.last_modified,
+                ),
+            )
+            connection.execute(
+                "DELETE FROM http_cache WHERE key IN ("
+                "SELECT key FROM (SELECT key, "
+                "ROW_NUMBER() OVER w AS position, SUM(size) OVER w AS total "
+                "FROM http_cache "
+                "WINDOW w AS (ORDER BY stored_at + ttl < ?, accessed_at DESC)) "
+                "WHERE position > ? OR total > ?)",
+                (now, self.maxsize, self.max_bytes),
+            )
+
+    def discard(self, key: str) -> None:
+        """Remove an entry.
+
+        :param key: str
+
+        """
+
+        self.connect().execute("DELETE FROM http_cache WHERE key = ?", (key,))
+
+    def keys(self) -> list:
+        """Return every key of the cache.
+
+        :return: list
+
+        """
+
+        rows = self.connect().execute("SELECT key FROM http_cache").fetchall()
+
+        return [row[0] for row in rows]
+
+    def purge(self) -> None:
+        """Delete every expired entry."""
+
+        self.connect().execute(
+            "DELETE FROM http_cache WHERE stored_at + ttl < ?", (time.time(),)
+        )
@@ -1,230 +1,252 @@
 """This module is mainly responsible for Adobe Captivate Prime APIs and their
 methods via ``CaptivatePrimeAPI`` class."""
 
-import configparser
 import logging
-import os
-from datetime import (
-    datetime,
-    timedelta,
+import threading
+import time
+from collections.abc import (
+    Callable,
+    Iterator,
 )
+from concurrent.futures import Future
+from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .base import BaseCaptivatePrimeAPI
+from .cache import (
+    CachedResponse,
+    CacheEntry,
+)
+from .checkpoint import Checkpoint
+from .codec import next_link
+from .identity_map import IdentityMap
+from .models import Resource
+from .paging import page_limit
+from .params import canonical_url
+from .scan import (
+    iter_documents,
+    page_records,
+)
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
-config = configparser.ConfigParser()
 
 
-class CaptivatePrimeAPI:
-    """CaptivatePrimeAPI Class."""
+class CaptivatePrimeAPI(BaseCaptivatePrimeAPI):
+    """CaptivatePrimeAPI Class.
 
-    config_file = "config.cfg"
-    default_server_instance = "captivateprime"
+    Synchronous client: every call goes through one pooled
+    ``requests.Session``, see ``BaseCaptivatePrimeAPI`` for the settings and
+    tokens it keeps.
 
-    def __init__(  # pylint:disable=too-many-arguments,too-many-branches
+    """
+
+    def init_session(  # pylint:disable=too-many-arguments
         self,
-        server_instance=None,
-        application_id=None,
-        application_secret=None,
-        application_url=None,
-        application_scopes=None,
-        access_token=None,
-        refresh_token=None,
-    ):
-
-        config["CAPTIVATE"] = {
-            "server_instance": f"{server_instance}",
-            "application_id": f"{application_id}",
-            "application_secret": f"{application_secret}",
-            "application_url": f"{application_url}",
-            "application_scopes": f"{application_scopes}",
-            "access_token": f"{access_token}",
-            "refresh_token": f"{refresh_token}",
-        }
+        session: requests.Session = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        """Use ``session`` or create a pooled one with ``create_session``.
 
-        config["APP"] = {
-            "account_id": "",
-            "user_id": "",
-            "user_role": "",
-            "checked_at": "",
-            "refreshed_at": "",
-            "expires_on": "",
-        }
+        :param session: requests.Session
+        :param pool_connections: int
+        :param pool_maxsize: int
+        :param pool_block: bool
+        :param keep_alive: bool
+
+        """
 
-        if not os.path.exists(self.config_file):
-            logging.error(
-                "Configuration file is not valid, please provide a valid %s",
-                self.config_file,
+        if session is None:
+            session = self.create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
             )
-            self.write_config()
-        else:
-            config.read(self.config_file)
-
-            if config.has_section(section="CAPTIVATE"):
-                if server_instance:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="server_instance",
-                        value=server_instance,
-                    )
-                    logging.debug(
-                        'Config file updated with "server_instance = %s"',
-                        server_instance,
-                    )
-                elif config["CAPTIVATE"]["server_instance"] is None:
-                    self.server_instance = self.default_server_instance
-                    logging.debug(
-                        'Config file updated with "server_instance = %s"',
-                        self.default_server_instance,
-                    )
-                else:
-                    self.server_instance = config["CAPTIVATE"]["server_instance"]
-                if application_id:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="application_id",
-                        value=application_id,
-                    )
-                    logging.debug(
-                        'Config file updated with "application_id = %s"', application_id
-                    )
-                else:
-                    self.application_id = config["CAPTIVATE"]["application_id"]
-                if application_secret:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="application_secret",
-                        value=application_secret,
-                    )
-                    logging.debug(
-                        'Config file updated with "application_secret = %s"',
-                        application_secret,
-                    )
-                else:
-                    self.application_secret = config["CAPTIVATE"]["application_secret"]
-                if application_url:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="application_url",
-                        value=application_url,
-                    )
-                    logging.debug(
-                        'Config file updated with "application_url = %s"',
-                        application_url,
-                    )
-                else:
-                    self.application_url = config["CAPTIVATE"]["application_url"]
-                if application_scopes:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="application_scopes",
-                        value=application_scopes,
-                    )
-                    logging.debug(
-                        'Config file updated with "application_scopes = %s"',
-                        application_scopes,
-                    )
-                else:
-                    self.application_scopes = config["CAPTIVATE"]["application_scopes"]
-                if access_token:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="access_token",
-                        value=access_token,
-                    )
-                    logging.debug(
-                        'Config file updated with "access_token = %s"',
-                        access_token,
-                    )
-                else:
-                    self.access_token = config["CAPTIVATE"]["access_token"]
-                if refresh_token:
-                    config.set(
-                        section="CAPTIVATE",
-                        option="refresh_token",
-                        value=refresh_token,
-                    )
-                    logging.debug(
-                        'Config file updated with "refresh_token = %s"',
-                        refresh_token,
-                    )
-                else:
-                    self.refresh_token = config["CAPTIVATE"]["refresh_token"]
+        self.session = session
 
-                self.write_config()
-            else:
-                self.write_config()
+    @staticmethod
+    def create_session(
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> requests.Session:
+        """Create the pooled HTTP session shared by every call of the client.
+
+        ``pool_connections`` is the number of per-host pools to keep,
+        ``pool_maxsize`` is the number of connections kept alive per host and
+        ``pool_block`` makes callers wait for a free connection instead of
+        opening a throwaway one once a host pool is exhausted.
+
+        :param pool_connections: int
+        :param pool_maxsize: int
+        :param pool_block: bool
+        :param keep_alive: bool
+        :return: requests.Session
+
+        """
 
-    def fetch(  # pylint:disable=too-many-branches
-        self, method: str, endpoint: str = None, params: dict = None
-    ) -> list:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections. A
+        session passed in by the caller, e.g. by ``ClientRegistry``, is left
+        open for its other users."""
+
+        if self.owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def fetch(
+        self,
+        method: str,
+        endpoint: str = None,
+        params: dict = None,
+        stream: bool = False,
+        **options,
+    ) -> list | Iterator[dict]:
         """Generic API call function.
 
+        Collects every record of every page into a list. With ``stream`` the
+        records are yielded through ``iter_fetch`` as the pages arrive.
+
+        :param method: str
+        :param endpoint: str
+        :param params: dict
+        :param stream: bool
+        :param options: keyword arguments of ``iter_fetch``
+        :return: list or Iterator[dict]
+
+        """
+
+        records = self.iter_fetch(
+            method=method, endpoint=endpoint, params=params, **options
+        )
+
+        return records if stream else list(records)
+
+    def iter_fetch(  # pylint:disable=too-many-arguments,too-many-locals
+        self,
+        method: str,
+        endpoint: str = None,
+        params: dict = None,
+        pages: bool = False,
+        identity_map: IdentityMap = None,
+        raw: bool = False,
+        models: bool = False,
+        parallel: int = None,
+        partitions: list | bool = None,
+        dedupe: bool = False,
+        prefetch: int = None,
+        max_items: int = None,
+        take_while: Callable[[dict], bool] = None,
+        checkpoint: Checkpoint = None,
+    ) -> Iterator[dict | bytes | Resource]:
+        """Generator counterpart of ``fetch``.
+
+        Yields records one by one while following ``links.next``, so only a
+        single page is held in memory at a time. With ``pages`` the whole JSON
+        document of each page, including its ``included`` resources, is
+        yielded instead; pages served from ``self.cache`` carry the age of
+        their data in seconds as ``meta.age``. With ``raw`` the undecoded body
+        of each page is yielded, for callers that only store or forward it.
+        With ``models`` records of the types in ``models.MODELS`` are yielded as
+        compact ``Resource`` objects rather than dicts.
+
+        With ``parallel`` endpoints paginated by ``page[offset]`` are scanned
+        that many offset windows at a time, see ``scan.iter_offset_pages``.
+        With ``partitions`` the scan is split into disjoint partitions scanned
+        concurrently, see ``scan.iter_partitioned_pages``. ``dedupe`` drops
+        records whose ``id`` was already yielded. With ``prefetch`` up to that
+        many pages are fetched in the background while the caller works on
+        the current one.
+
+        The scan stops early, without requesting further pages, after
+        ``max_items`` records or at the first record (a dict, in the order of
+        the scan) for which ``take_while`` returns a false value, e.g.
+        "enrolled since T" on a scan sorted by ``-dateEnrolled``. Neither
+        applies to ``raw`` pages.
+
+        With a ``checkpoint`` the scan resumes after the last page saved for
+        the same endpoint and parameters, and saves its progress as it goes,
+        see ``checkpoint.Checkpoint``.
+
+        With an ``identity_map`` (or the client's one) the ``included``
+        resources of every page are kept in it, and records and sideloads are
+        deduplicated by ``(type, id)`` so relationships can be resolved with
+        ``IdentityMap.resolve`` instead of another request.
+
         :param method: str
         :param endpoint: str
         :param params: dict
-        :return: list
+        :param pages: bool
+        :param identity_map: IdentityMap
+        :param raw: bool
+        :param models: bool
+        :param parallel: int
+        :param partitions: list of dict or True
+        :param dedupe: bool
+        :param prefetch: int
+        :param max_items: int
+        :param take_while: callable
+        :param checkpoint: Checkpoint
+        :return: Iterator[dict | bytes | Resource]
         :raises: NotImplementedError: Not implemented.
         :exception Exception: Broad exception.
 
         """
 
         url = f"https://{self.server_instance}.adobe.com/primeapi/v2/{endpoint}"
-        headers = {
-            "Accept": "application/vnd.api+json",
-            "Authorization": f"oauth {self.access_token}",
-        }
+        if identity_map is None:
+            identity_map = self.identity_map
 
         try:
-            if method in ("get", "GET"):
-                r_data = []
-                while url:
-                    logging.debug(url)
-                    r = requests.get(url=url, params=params, headers=headers)
-                    r_json = r.json()
-                    if r.status_code == 200:
-                        if "data" in r_json:
-                            if isinstance(r_json["data"], list):
-                                r_data.extend(r_json["data"])
-                            elif isinstance(r_json["data"], dict):
-                                r_data.append(dict(r_json["data"]))
-                            try:
-                                url = r_json["links"]["next"]
-                                params = {}
-                            except KeyError:
-                                url = None
-                        else:
-                            logging.debug("Response has no data: %s", url)
-                            url = None
-                    elif r.status_code == 400:
-                        logging.error(
-                            "%s %s - %s: %s",
-                            r.status_code,
-                            r_json["status"],
-                            r_json["title"],
-                            r_json["source"]["info"],
-                        )
-                        url = None
-                    elif r.status_code == 401:
-                        logging.error(
-                            "%s %s - %s: %s",
-                            r.status_code,
-                            r_json["status"],
-                            r_json["title"],
-                            r_json["source"]["info"],
-                        )
-                        logging.info(
-                            "A generic http unauthorized access error. "
-                            "Access is denied due to invalid credentials. "
-                            "Automatic process will try to refresh it..."
-                        )
-                        if not self.check_access_token():
-                            url = None
-                    else:
-                        logging.error("%s %s", r.status_code, r.reason)
-                        url = None
-
-                return r_data
+            if method in ("get", "GET") and raw:
+                yield from iter_documents(
+                    self,
+                    url=url,
+                    params=params,
+                    raw=True,
+                    parallel=parallel,
+                    partitions=partitions,
+                    prefetch=prefetch,
+                    checkpoint=checkpoint,
+                )
+            elif method in ("get", "GET"):
+                for r_json in iter_documents(
+                    self,
+                    url=url,
+                    params=params,
+                    parallel=parallel,
+                    partitions=partitions,
+                    dedupe=dedupe,
+                    prefetch=prefetch,
+                    max_items=max_items,
+                    take_while=take_while,
+                    checkpoint=checkpoint,
+                ):
+                    yield from page_records(r_json, pages, models, identity_map)
             elif method in ("post", "POST"):
                 # TODO: POST
                 # r = requests.post(url=url, params=params, headers=headers)
@@ -238,42 +260,372 @@ class CaptivatePrimeAPI:
                 # r = requests.delete(url=url, params=params, headers=headers)
                 raise NotImplementedError("DELETE method is not yet implemented.")
         except Exception as e:
-            logging.error(str(e), url)
+            logging.error("%s: %s", str(e), url)
             raise Exception from e
 
-    @staticmethod
-    def create_tokens():
-        """Captivate Prime APIs use OAuth 2.0 framework to authenticate and
-        authorize your client applications.
+    def iter_pages(  # pylint:disable=too-many-branches,too-many-statements
+        self,
+        url: str,
+        params: dict = None,
+        raw: bool = False,
+        adaptive: bool = True,
+        max_size: int = None,
+    ) -> Iterator[dict | bytes]:
+        """Yield the JSON document of every page, following ``links.next``
+        until the last page. Documents are decoded with ``self.json_loads``
+        only once the status is known; with ``raw`` the undecoded body is
+        yielded instead. Without ``adaptive`` the page size is left as given
+        rather than set by ``self.paging``; a size the API rejects still
+        lowers the policy's size, but the page is not requested again.
+        ``max_size`` caps the policy's size, e.g. for a scan stopping after
+        fewer records; such pages neither adapt nor shrink the policy's size.
+
+        :param url: str
+        :param params: dict
+        :param raw: bool
+        :param adaptive: bool
+        :param max_size: int
+        :return: Iterator[dict | bytes]
+        :raises RuntimeError: a page kept failing with a retryable status.
+        :raises requests.Timeout: a page timed out and its size cannot shrink any
+            further, or no paging size is in effect.
+
+        """
+
+        while url:
+            logging.debug(url)
+            self.ensure_access_token()
+            access_token = self.access_token
+            size = None
+            if self.paging is not None and adaptive:
+                url, params, size = self.paging.apply(
+                    url=url, params=params, max_size=max_size
+                )
+            adapting = size is not None and size != max_size
+            shrinkable = adapting and self.paging.can_shrink(size)
+            started = time.monotonic()
+            try:
+                r = self.get_page(url=url, params=params, retry_timeouts=not shrinkable)
+            except requests.Timeout:
+                if not shrinkable or not self.paging.shrink(url=url, size=size):
+                    raise
+                continue
+            if adapting and r.status_code == 200:
+                if not isinstance(r, CachedResponse):
+                    self.paging.observe(
+                        url=url,
+                        size=size,
+                        elapsed=time.monotonic() - started,
+                        nbytes=len(r.content),
+                    )
+            if r.status_code == 400:
+                r_json = self.json_loads(r.content)
+                requested = size or page_limit(url, params)
+                if requested and self.paging is not None:
+                    if self.paging.reject(url, requested, r_json) and adaptive:
+                        continue
+
+            if r.status_code == 200 and raw:
+                yield r.content
+                url = next_link(r.content, self.json_loads)
+                params = {}
+            elif r.status_code == 200:
+                r_json = self.json_loads(r.content)
+                if "data" in r_json:
+                    if isinstance(r, CachedResponse):
+                        r_json.setdefault("meta", {})["age"] = r.age
+                    yield r_json
+                    try:
+                        url = r_json["links"]["next"]
+                        params = {}
+                    except KeyError:
+                        url = None
+                else:
+                    logging.debug("Response has no data: %s", url)
+                    url = None
+            elif r.status_code == 400:
+                self._log_api_error(r.status_code, r_json)
+                url = None
+            elif r.status_code == 401:
+                self._log_api_error(r.status_code, self.json_loads(r.content))
+                if access_token == self.access_token:
+                    self.expires_on = None
+                    if not self.check_access_token():
+                        url = None
+                else:
+                    logging.debug('"access_token" was refreshed meanwhile: %s', url)
+            elif self.retry.is_retryable("GET", r.status_code):
+                raise RuntimeError(
+                    f"{r.status_code} {r.reason} after "
+                    f"{self.retry.max_attempts} attempts: {url}"
+                )
+            else:
+                logging.error("%s %s", r.status_code, r.reason)
+                url = None
+
+    def get_page(
+        self, url: str, params: dict = None, retry_timeouts: bool = True
+    ) -> requests.Response | CachedResponse:
+        """GET one page. With ``self.coalesce`` concurrent calls for the same
+        URL and parameters share a single request and its response.
+
+        :param url: str
+        :param params: dict
+        :param retry_timeouts: bool, see ``request``
+        :return: requests.Response or CachedResponse
+        :raises BaseException: the error of the shared request, in the caller
+            that sent it as in every caller waiting for it.
+
+        """
+
+        if not self.coalesce:
+            return self.get_cached_page(
+                url=url, params=params, retry_timeouts=retry_timeouts
+            )
+
+        key = canonical_url(url, params)
+        with self.in_flight_lock:
+            future = self.in_flight.get(key)
+            if leader := future is None:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            logging.debug("Coalesced with in-flight request: %s", key)
+            return future.result()
+
+        try:
+            r = self.get_cached_page(
+                url=url, params=params, retry_timeouts=retry_timeouts
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(r)
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[key]
+
+        return r
+
+    def get_cached_page(
+        self, url: str, params: dict = None, retry_timeouts: bool = True
+    ) -> requests.Response | CachedResponse:
+        """GET one page, served from ``self.cache`` while the cached copy is
+        fresh. A stale copy is revalidated with ``If-None-Match`` and
+        ``If-Modified-Since``, and a 304 answer is served from the cached body.
+        Within the cache's ``stale_while_revalidate`` window the stale copy is
+        returned at once and revalidated by a background thread.
+
+        :param url: str
+        :param params: dict
+        :param retry_timeouts: bool, see ``request``
+        :return: requests.Response or CachedResponse
+
+        """
+
+        if (ttl := self.cache.ttl_for(url) if self.cache is not None else 0) <= 0:
+            return self.request(
+                "GET",
+                url=url,
+                params=params,
+                headers=self.headers,
+                retry_timeouts=retry_timeouts,
+            )
+
+        key = self.cache.key(url, params, identity=self.cache_identity)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            logging.debug("Cache hit: %s", key)
+            return CachedResponse(entry)
+        if entry is not None and self.cache.serves_stale(entry):
+            logging.debug("Cache stale hit: %s", key)
+            if self.cache.begin_refresh(key):
+                threading.Thread(
+                    target=self._refresh_page,
+                    args=(url, params, key, ttl, entry),
+                    daemon=True,
+                ).start()
+            return CachedResponse(entry)
+
+        return self._fetch_page(
+            url, params, key, ttl, entry, retry_timeouts=retry_timeouts
+        )
 
-        :raise NotImplementedError: Not implemented.
+    def _fetch_page(  # pylint:disable=too-many-arguments
+        self,
+        url: str,
+        params: dict,
+        key: str,
+        ttl: float,
+        entry: CacheEntry | None,
+        retry_timeouts: bool = True,
+    ) -> requests.Response | CachedResponse:
+        """GET a cacheable page, conditionally when a stale entry exists.
+
+        :param url: str
+        :param params: dict
+        :param key: str
+        :param ttl: float
+        :param entry: the stale entry, if any
+        :param retry_timeouts: bool, see ``request``
+        :return: requests.Response or CachedResponse
 
         """
 
-        logging.error(
-            "Captivate Prime APIs use OAuth 2.0 framework to "
-            "authenticate and authorize the application. Due to limitations "
-            "it is only possible to authenticate with login, manually."
+        headers = self.headers
+        if entry is not None:
+            headers.update(entry.validators)
+        r = self.request(
+            "GET",
+            url=url,
+            params=params,
+            headers=headers,
+            retry_timeouts=retry_timeouts,
         )
 
-        raise NotImplementedError("Authenticate manually and set tokens in config.cfg")
+        return self._cache_page(key, ttl, entry, r)
+
+    def _refresh_page(  # pylint:disable=too-many-arguments
+        self, url: str, params: dict, key: str, ttl: float, entry: CacheEntry
+    ) -> None:
+        """Revalidate a stale page in the background.
+
+        :param url: str
+        :param params: dict
+        :param key: str
+        :param ttl: float
+        :param entry: CacheEntry
+
+        """
+
+        try:
+            self.ensure_access_token()
+            self._fetch_page(url, params, key, ttl, entry)
+        except Exception as e:  # pylint:disable=broad-except
+            logging.warning("Background refresh failed: %s: %s", str(e), url)
+        finally:
+            self.cache.end_refresh(key)
+
+    def request(
+        self, method: str, url: str, retry_timeouts: bool = True, **kwargs
+    ) -> requests.Response:
+        """Send a request through the pooled session.
+
+        Every attempt first takes a token from ``self.rate_limiter`` when one
+        is configured, and times out after ``self.paging.timeout`` seconds
+        when a paging policy is set. Throttled and transient failures are
+        repeated according to ``self.retry`` for the very same URL, so a
+        paginated scan resumes from the page that failed. The last response is
+        returned once the attempts are used up; the last connection error is
+        raised. Without ``retry_timeouts`` a timeout is raised at once, so
+        ``iter_pages`` can shrink the page size instead of asking for the same
+        page again.
+
+        :param method: str
+        :param url: str
+        :param retry_timeouts: bool
+        :param kwargs: forwarded to ``requests.Session.request``
+        :return: requests.Response
+        :raises requests.ConnectionError: connection failed on every attempt.
+        :raises requests.Timeout: request timed out on every attempt, or once
+            without ``retry_timeouts``.
+
+        """
+
+        if self.paging is not None and self.paging.timeout:
+            kwargs.setdefault("timeout", self.paging.timeout)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                r = self.session.request(method=method, url=url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if (
+                    attempt >= self.retry.max_attempts
+                    or not self.retry.is_retryable(method)
+                    or (isinstance(e, requests.Timeout) and not retry_timeouts)
+                ):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logging.warning(
+                    "%s, retrying %s in %.2fs (attempt %s of %s)",
+                    e,
+                    url,
+                    delay,
+                    attempt,
+                    self.retry.max_attempts,
+                )
+            else:
+                if attempt >= self.retry.max_attempts or not self.retry.is_retryable(
+                    method, r.status_code
+                ):
+                    return r
+                delay = self.retry.backoff(attempt, r.headers.get("Retry-After"))
+                logging.warning(
+                    "%s %s, retrying %s in %.2fs (attempt %s of %s)",
+                    r.status_code,
+                    r.reason,
+                    url,
+                    delay,
+                    attempt,
+                    self.retry.max_attempts,
+                )
+            time.sleep(delay)
+
+    def ensure_access_token(self) -> None:
+        """Refresh the access token ahead of time when it expires within
+        ``refresh_margin`` seconds.
+
+        An unknown expiry is looked up once with ``check_access_token``, so
+        long scans renew the token before it runs out instead of running into
+        a 401 and repeating the page. When such a refresh fails, the current
+        token is used until it actually expires, see ``defer_refresh``.
+
+        :raises RuntimeError: the token expired and could not be refreshed.
+
+        """
+
+        if not self.refresh_due():
+            return
+
+        if self.expires_on is not None:
+            logging.info(
+                '"access_token" expires on %s and will be refreshed ahead of time',
+                datetime.fromtimestamp(self.expires_on).isoformat(),
+            )
+            try:
+                self.refresh_access_token()
+            except Exception as e:  # pylint:disable=broad-except
+                self.defer_refresh(e)
+        elif not self.token_checked:
+            self.check_access_token()
 
     def check_access_token(self):
         """Checks in access token and check if it is expired or not.
 
-        Logs remaining days and seconds.
+        Logs remaining days and seconds. No request is made while the token is
+        known to be valid, see ``token_is_valid``.
         :return: True/False
         :rtype: Boolean
 
         """
 
+        if self.token_is_valid():
+            return True
+
+        self.token_checked = True
+
         params = {
             "access_token": self.access_token,
         }
 
         url = f"https://{self.server_instance}.adobe.com/oauth/token/check"
 
-        r = requests.get(
+        r = self.request(
+            "GET",
             url=url,
             params=params,
         )
@@ -289,67 +641,7 @@ class CaptivatePrimeAPI:
                 return self.refresh_access_token()
 
             elif "expires_in" in r_json:
-                checked_at = datetime.timestamp(datetime.utcnow())
-                expires_on = datetime.timestamp(
-                    datetime.utcnow() + timedelta(0, r_json["expires_in"])
-                )
-                expires_on_human = datetime.fromtimestamp(expires_on).isoformat()
-                logging.info('"access_token" will be valid until %s', expires_on_human)
-
-                if not config.has_section(section="APP"):
-                    config.add_section(section="APP")
-                config.set(
-                    section="APP",
-                    option="account_id",
-                    value=str(r_json["account_id"]),
-                )
-                logging.debug(
-                    'Config file updated with "account_id = %s"',
-                    str(r_json["account_id"]),
-                )
-
-                config.set(
-                    section="APP",
-                    option="user_id",
-                    value=str(r_json["user_id"]),
-                )
-                logging.debug(
-                    'Config file updated with "user_id = %s"',
-                    str(r_json["user_id"]),
-                )
-
-                config.set(
-                    section="APP",
-                    option="user_role",
-                    value=r_json["user_role"],
-                )
-                logging.debug(
-                    'Config file updated with "user_role = %s"',
-                    r_json["user_role"],
-                )
-
-                config.set(
-                    section="APP",
-                    option="checked_at",
-                    value=str(checked_at),
-                )
-                logging.debug(
-                    'Config file updated with "checked_at = %s"',
-                    str(checked_at),
-                )
-
-                config.set(
-                    section="APP",
-                    option="expires_on",
-                    value=str(expires_on),
-                )
-                logging.debug(
-                    'Config file updated with "expires_on = %s"',
-                    str(expires_on),
-                )
-
-                self.write_config(content=config)
-                return True
+                return self._store_token_check(r_json)
         else:
             logging.error("%s %s", r.status_code, r.reason)
             return False
@@ -364,10 +656,20 @@ class CaptivatePrimeAPI:
 
         """
 
-        config.read(self.config_file)
+        stale_token = self.access_token
+        with self.store.lock():
+            if self.reload_access_token(stale_token=stale_token):
+                return True
+
+            return self._refresh_access_token()
+
+    def _refresh_access_token(self):
+        """Call ``/oauth/token/refresh``; see ``refresh_access_token``.
 
-        if not config.has_section(section="APP"):
-            config.add_section(section="APP")
+        :return: True
+        :rtype: Boolean
+
+        """
 
         url = f"https://{self.server_instance}.adobe.com/oauth/token/refresh"
 
@@ -381,115 +683,13 @@ class CaptivatePrimeAPI:
             "refresh_token": self.refresh_token,
         }
 
-        r = requests.post(
+        r = self.request(
+            "POST",
             url=url,
             headers=headers,
             params=params,
         )
 
-        r_json = r.json()
-
-        if r.status_code == 200:
-            access_token = r_json["access_token"]
-            refresh_token = r_json["refresh_token"]
-            refreshed_at = datetime.timestamp(datetime.utcnow())
-
-            config.set(
-                section="APP",
-                option="checked_at",
-                value=str(refreshed_at),
-            )
-            logging.debug(
-                'Config file updated with "checked_at = %s"', str(refreshed_at)
-            )
-
-            if access_token != config["CAPTIVATE"]["access_token"]:
-
-                expires_on = datetime.timestamp(
-                    datetime.utcnow() + timedelta(0, r_json["expires_in"])
-                )
-                expires_on_human = datetime.fromtimestamp(expires_on).isoformat()
-
-                self.access_token = access_token
-                config.set(
-                    section="CAPTIVATE",
-                    option="access_token",
-                    value=access_token,
-                )
-                logging.debug(
-                    'Config file updated with "access_token = %s"',
-                    access_token,
-                )
-
-                self.refresh_token = refresh_token
-                config.set(
-                    section="CAPTIVATE",
-                    option="refresh_token",
-                    value=refresh_token,
-                )
-                logging.debug(
-                    'Config file updated with "refresh_token = %s"',
-                    refresh_token,
-                )
-
-                config.set(
-                    section="APP",
-                    option="refreshed_at",
-                    value=str(refreshed_at),
-                )
-                logging.debug(
-                    'Config file updated with "refreshed_at = %s"',
-                    str(refreshed_at),
-                )
-
-                config.set(
-                    section="APP",
-                    option="expires_on",
-                    value=str(expires_on),
-                )
-                logging.debug(
-                    'Config file updated with "expires_on = %s"',
-                    str(expires_on),
-                )
-
-                logging.info(
-                    '"access_token" has been refreshed and will be valid until %s',
-                    expires_on_human,
-                )
-
-            self.write_config(content=config)
-            return True
-        elif r.status_code == 400:
-            logging.error(
-                "%s %s - %s: %s",
-                r.status_code,
-                r_json["status"],
-                r_json["title"],
-                r_json["source"]["info"],
-            )
-            raise RuntimeError(
-                f"{r.status_code} {r_json['status']} - "
-                f"{r_json['title']}: {r_json['source']['info']}"
-            )
-        else:
-            logging.error("%s %s", r.status_code, r.reason)
-            raise RuntimeError(
-                f"Unexpected error: {r.status_code} {r.reason} while refreshing token!",
-            )
-
-    def write_config(
-        self,
-        content: configparser = config,
-    ) -> None:
-        """Write config to file.
-
-        :param content: ConfigParser
-        :raise RuntimeError: error while writing to the config file.
-
-        """
-        try:
-            with open(self.config_file, "w", encoding="utf-8") as configfile:
-                content.write(configfile)
-        except Exception as e:
-            logging.critical("Config file could not be saved: %s", str(e))
-            raise RuntimeError from e
+        return self._store_token_refresh(
+            status_code=r.status_code, reason=r.reason, r_json=r.json()
+        )
@@ -0,0 +1,238 @@
+"""This module provides the checkpoint stores that let long paginated scans
+resume where they stopped instead of starting over."""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .locking import file_lock
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class Checkpoint:
+    """Checkpoint Class.
+
+    Keeps the progress of scans in memory, by scan key: the ``next`` URL of
+    the last completed page and the number of pages and records emitted so
+    far. A page is completed once the consumer asked for what follows it, and
+    progress is saved every ``every`` pages and at the end of a scan, where
+    the checkpoint is cleared. Subclasses persist it so that a scan survives
+    the process, and set ``blocking`` so that async scans load, save and
+    clear it on a worker thread.
+
+    """
+
+    blocking = False
+
+    def __init__(self, every: int = 1):
+        self.every = max(1, every)
+        self.states = {}
+        self.lock = threading.Lock()
+
+    def load(self, key: str) -> dict | None:
+        """Return the saved progress of a scan, ``None`` when there is none.
+
+        :param key: str
+        :return: dict with ``next``, ``pages`` and ``records``, or None
+
+        """
+
+        with self.lock:
+            state = self.states.get(key)
+
+        return dict(state) if state else None
+
+    def save(self, key: str, state: dict) -> None:
+        """Save the progress of a scan.
+
+        :param key: str
+        :param state: dict with ``next``, ``pages`` and ``records``
+
+        """
+
+        with self.lock:
+            self.states[key] = {**state, "saved_at": time.time()}
+
+    def clear(self, key: str) -> None:
+        """Forget the progress of a completed scan.
+
+        :param key: str
+
+        """
+
+        with self.lock:
+            self.states.pop(key, None)
+
+
+class FileCheckpoint(Checkpoint):
+    """FileCheckpoint Class.
+
+    Persists checkpoints to a JSON file. Every save re-reads the file under
+    ``file_lock`` on ``<path>.lock`` and atomically replaces it, so several
+    scans, even in different processes, can share one file.
+
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = "checkpoints.json", every: int = 1):
+        super().__init__(every=every)
+        self.path = path
+
+    def read(self) -> dict:
+        """Return every checkpoint of the file.
+
+        :return: dict
+
+        """
+
+        try:
+            with open(self.path, encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+
+    def write(self, states: dict) -> None:
+        """Atomically replace the file.
+
+        :param states: dict
+
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=".checkpoint-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as checkpoint_file:
+                json.dump(states, checkpoint_file)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def load(self, key: str) -> dict | None:
+        """Return the saved progress of a scan from the file.
+
+        :param key: str
+        :return: dict or None
+
+        """
+
+        with file_lock(f"{self.path}.lock"):
+            return self.read().get(key)
+
+    def save(self, key: str, state: dict) -> None:
+        """Save the progress of a scan to the file.
+
+        :param key: str
+        :param state: dict
+
+        """
+
+        with file_lock(f"{self.path}.lock"):
+            states = self.read()
+            states[key] = {**state, "saved_at": time.time()}
+            self.write(states)
+
+    def clear(self, key: str) -> None:
+        """Remove the progress of a completed scan from the file.
+
+        :param key: str
+
+        """
+
+        with file_lock(f"{self.path}.lock"):
+            states = self.read()
+            if states.pop(key, None) is not None:
+                self.write(states)
+
+
+class SQLiteCheckpoint(Checkpoint):
+    """SQLiteCheckpoint Class.
+
+    Persists checkpoints to a SQLite database, one row per scan, for
+    processes that already keep their state in SQLite or save very often.
+
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, every: int = 1, timeout: float = 30.0):
+        super().__init__(every=every)
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+
+        self.connect().execute(
+            "CREATE TABLE IF NOT EXISTS scan_checkpoint "
+            "(key TEXT PRIMARY KEY, next TEXT, pages INTEGER, records INTEGER, "
+            "saved_at REAL)"
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the checkpoint database.
+
+        :return: sqlite3.Connection
+
+        """
+
+        if (connection := getattr(self.local, "connection", None)) is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self.local.connection = connection
+
+        return connection
+
+    def load(self, key: str) -> dict | None:
+        """Return the saved progress of a scan from its row.
+
+        :param key: str
+        :return: dict or None
+
+        """
+
+        row = (
+            self.connect()
+            .execute(
+                "SELECT next, pages, records, saved_at FROM scan_checkpoint "
+                "WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+
+        return dict(zip(("next", "pages", "records", "saved_at"), row))
+
+    def save(self, key: str, state: dict) -> None:
+        """Replace the row of a scan.
+
+        :param key: str
+        :param state: dict
+
+        """
+
+        self.connect().execute(
+            "INSERT OR REPLACE INTO scan_checkpoint "
+            "(key, next, pages, records, saved_at) VALUES (?, ?, ?, ?, ?)",
+            (key, state["next"], state["pages"], state["records"], time.time()),
+        )
+
+    def clear(self, key: str) -> None:
+        """Delete the row of a completed scan.
+
+        :param key: str
+
+        """
+
+        self.connect().execute("DELETE FROM scan_checkpoint WHERE key = ?", (key,))
@@ -0,0 +1,51 @@
+"""This module provides the JSON decoding used for API pages, ``orjson`` when it
+is installed and the standard library ``json`` otherwise."""
+
+import json
+import logging
+import re
+from collections.abc import Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+NEXT_LINK = re.compile(rb'"next"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def loads(content: bytes | str):
+    """Decode a JSON document, with ``orjson`` when available.
+
+    :param content: bytes or str
+    :return: decoded document
+    :rtype: dict, list, str, int, float, bool or None
+
+    """
+
+    if orjson is not None:
+        return orjson.loads(content)  # pylint:disable=no-member
+
+    return json.loads(content)
+
+
+def next_link(content: bytes, json_loads: Callable = loads) -> str | None:
+    """Return ``links.next`` of a raw page without decoding its records.
+
+    The top-level ``links`` member follows the records, so only the last
+    ``"links"`` of the body is scanned. When it has no ``next`` the page is
+    decoded with ``json_loads`` to be sure it is the last one.
+
+    :param content: bytes
+    :param json_loads: callable decoding bytes
+    :return: str or None
+
+    """
+
+    if (start := content.rfind(b'"links"')) != -1:
+        if match := NEXT_LINK.search(content, start):
+            return json.loads(match.group(1))
+
+    return json_loads(content).get("links", {}).get("next")
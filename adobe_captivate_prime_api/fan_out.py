@@ -0,0 +1,150 @@
+"""This module provides helpers to run one ``users/{id}/*`` endpoint function
+for many users concurrently, e.g. ``get_all_enrollments_of_user`` for every
+learner of an account."""
+
+import asyncio
+import logging
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import NamedTuple
+
+from .async_captivate_prime_api import AsyncCaptivatePrimeAPI
+from .captivate_prime_api import CaptivatePrimeAPI
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class FanOutResult(NamedTuple):
+    """Outcome of one call of a fan-out. ``records`` is ``None`` and ``error``
+    holds the raised exception when the call failed."""
+
+    user_id: str
+    records: list | None
+    error: Exception | None = None
+
+
+def fan_out(
+    api: CaptivatePrimeAPI,
+    function: Callable,
+    user_ids: Iterable[str],
+    max_workers: int = 8,
+    **kwargs,
+) -> Iterator[FanOutResult]:
+    """Call ``function(api, user_id, **kwargs)`` for every user id on a bounded
+    thread pool and yield the results in completion order.
+
+    At most ``max_workers`` calls run at once and ``user_ids`` is consumed
+    lazily, so it may be a generator over a very large account. A failing call
+    is reported through ``FanOutResult.error`` and does not stop the batch.
+    The client's ``pool_maxsize`` should be at least ``max_workers``.
+
+    :param api: CaptivatePrimeAPI
+    :param function: Callable
+    :param user_ids: Iterable[str]
+    :param max_workers: int
+    :param kwargs: forwarded to ``function``
+    :return: Iterator[FanOutResult]
+    :raises TypeError: ``api`` is not a ``CaptivatePrimeAPI``.
+
+    """
+
+    if not isinstance(api, CaptivatePrimeAPI):
+        raise TypeError(
+            f"fan_out requires a CaptivatePrimeAPI, not {type(api).__name__}; "
+            "use async_fan_out with AsyncCaptivatePrimeAPI"
+        )
+
+    user_ids = iter(user_ids)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit() -> None:
+            for user_id in user_ids:
+                future = executor.submit(function, api, user_id, **kwargs)
+                pending[future] = user_id
+                if len(pending) >= max_workers:
+                    return
+
+        submit()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    user_id = pending.pop(future)
+                    try:
+                        records = future.result()
+                    except Exception as e:  # pylint:disable=broad-except
+                        logging.error("%s failed for user %s: %s", function, user_id, e)
+                        yield FanOutResult(user_id=user_id, records=None, error=e)
+                    else:
+                        yield FanOutResult(user_id=user_id, records=records)
+                submit()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def async_fan_out(
+    api: AsyncCaptivatePrimeAPI,
+    function: Callable,
+    user_ids: Iterable[str],
+    concurrency: int = 50,
+    **kwargs,
+) -> AsyncIterator[FanOutResult]:
+    """Async counterpart of ``fan_out`` for ``AsyncCaptivatePrimeAPI``: runs up
+    to ``concurrency`` calls as tasks on the running loop and yields the
+    results in completion order.
+
+    :param api: AsyncCaptivatePrimeAPI
+    :param function: Callable
+    :param user_ids: Iterable[str]
+    :param concurrency: int
+    :param kwargs: forwarded to ``function``
+    :return: AsyncIterator[FanOutResult]
+    :raises TypeError: ``api`` is not an ``AsyncCaptivatePrimeAPI``.
+
+    """
+
+    if not isinstance(api, AsyncCaptivatePrimeAPI):
+        raise TypeError(
+            f"async_fan_out requires an AsyncCaptivatePrimeAPI, not "
+            f"{type(api).__name__}; use fan_out with CaptivatePrimeAPI"
+        )
+
+    user_ids = iter(user_ids)
+    pending = {}
+
+    def submit() -> None:
+        for user_id in user_ids:
+            task = asyncio.ensure_future(function(api, user_id, **kwargs))
+            pending[task] = user_id
+            if len(pending) >= concurrency:
+                return
+
+    submit()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                user_id = pending.pop(task)
+                try:
+                    records = task.result()
+                except Exception as e:  # pylint:disable=broad-except
+                    logging.error("%s failed for user %s: %s", function, user_id, e)
+                    yield FanOutResult(user_id=user_id, records=None, error=e)
+                else:
+                    yield FanOutResult(user_id=user_id, records=records)
+            submit()
+    finally:
+        for task in pending:
+            task.cancel()
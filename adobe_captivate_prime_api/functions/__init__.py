@@ -2,27 +2,33 @@
 from .badges import (
     get_all_badges,
     get_badge,
+    iter_all_badges,
 )
 from .catalogs import (
     get_all_catalogs,
     get_catalog,
+    iter_all_catalogs,
 )
 from .external_profiles import (
     create_external_profile,
     get_all_external_profiles,
     get_all_users_of_external_profile,
     get_external_profile,
+    iter_all_external_profiles,
+    iter_all_users_of_external_profile,
     update_external_profile,
 )
 from .jobs import (
     create_job,
     get_all_jobs,
     get_job,
+    iter_all_jobs,
 )
 from .learning_objects import (
     get_all_learning_objects,
     get_instance_summary_of_learning_object,
     get_learning_object,
+    iter_all_learning_objects,
 )
 from .misc import (
     check_elthor_support,
@@ -33,6 +39,8 @@ from .misc import (
 from .skills import (
     get_all_skills,
     get_skill,
+    iter_all_skills,
+    iter_search_skill_interest,
     search_skill_interest,
 )
 from .user_groups import (
@@ -42,6 +50,10 @@ from .user_groups import (
     get_all_users_of_user_group,
     get_child_user_groups_of_user_group,
     get_user_group,
+    iter_all_user_groups,
+    iter_all_users_of_user_group,
+    iter_child_user_groups_of_user_group,
+    iter_search_user_groups,
     search_user_groups,
 )
 from .users import (
@@ -66,6 +78,15 @@ from .users import (
     get_user,
     get_user_groups_of_user,
     get_user_skill_of_user,
+    iter_all_accounts_of_email,
+    iter_all_badges_of_user,
+    iter_all_enrollments_of_user,
+    iter_all_user_badges_of_user_for_learning_object,
+    iter_all_user_notifications_of_user,
+    iter_all_user_skill_interests_of_user,
+    iter_all_user_skills_of_user,
+    iter_all_users,
+    iter_user_groups_of_user,
     redeem_external_gamification_point_of_user,
     update_enrollment_of_user,
     update_user,
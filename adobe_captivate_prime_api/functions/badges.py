@@ -3,12 +3,15 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_badges(
     api: CaptivatePrimeAPI,
     offset: int = 0,
     limit: int = 10,
     sort: str = "name",
+    **options,
 ) -> list:
     """Get a list of all badges created for an account in your organization.
 
@@ -17,6 +20,7 @@ def get_all_badges(
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -43,12 +47,17 @@ def get_all_badges(
         method="GET",
         endpoint="badges",
         params=params,
+        **options,
     )
 
 
+iter_all_badges = streaming(get_all_badges)
+
+
 def get_badge(
     api: CaptivatePrimeAPI,
     badge_id: str,
+    **options,
 ) -> list:
     """Get detailed information of a badge. The information includes badge
     name, badge image URL and status of the badge. Refer to badge model.
@@ -56,6 +65,7 @@ def get_badge(
     :param api: CaptivatePrimeAPI
     :type api: CaptivatePrimeAPI
     :param badge_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -63,4 +73,5 @@ def get_badge(
     return api.fetch(
         method="GET",
         endpoint=f"badges/{badge_id}",
+        **options,
     )
@@ -3,12 +3,15 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_catalogs(
     api: CaptivatePrimeAPI,
     offset: int = 0,
     limit: int = 10,
     sort: str = "name",
+    **options,
 ) -> list:
     """Get a list of catalogs for an account in your organization.
 
@@ -16,6 +19,7 @@ def get_all_catalogs(
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -46,18 +50,24 @@ def get_all_catalogs(
         method="GET",
         endpoint="catalogs",
         params=params,
+        **options,
     )
 
 
+iter_all_catalogs = streaming(get_all_catalogs)
+
+
 def get_catalog(
     api: CaptivatePrimeAPI,
     catalog_id: str,
+    **options,
 ) -> list:
     """Get detailed information of a catalog. It includes created and updated
     date, name, id, and status.
 
     :param api: CaptivatePrimeAPI
     :param catalog_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -65,4 +75,5 @@ def get_catalog(
     return api.fetch(
         method="GET",
         endpoint=f"catalogs/{catalog_id}",
+        **options,
     )
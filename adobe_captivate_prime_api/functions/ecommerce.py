@@ -7,11 +7,13 @@ from adobe_captivate_prime_api import CaptivatePrimeAPI
 def get_ecommerce_max_price(
     api: CaptivatePrimeAPI,
     lo_types: str | list = "course",
+    **options,
 ) -> list:
     """Retrieves max price of any LO present in account.
 
     :param api: CaptivatePrimeAPI
     :param lo_types: str or list
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -48,4 +50,5 @@ def get_ecommerce_max_price(
         method="GET",
         endpoint="ecommerce/maxPrice",
         params=params,
+        **options,
     )
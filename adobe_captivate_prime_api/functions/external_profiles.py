@@ -3,11 +3,14 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_external_profiles(
     api: CaptivatePrimeAPI,
     offset: int = 0,
     limit: int = 10,
+    **options,
 ) -> list:
     """Retrieves a list of external profiles given an account id which is
     subject to necessary permissions.
@@ -15,6 +18,7 @@ def get_all_external_profiles(
     :param api: CaptivatePrimeAPI
     :param offset: int
     :param limit: int
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -28,17 +32,23 @@ def get_all_external_profiles(
         method="GET",
         endpoint="externalProfiles",
         params=params,
+        **options,
     )
 
 
+iter_all_external_profiles = streaming(get_all_external_profiles)
+
+
 def get_external_profile(
     api: CaptivatePrimeAPI,
     external_profile_id: str,
+    **options,
 ) -> list:
     """Retrieve an external profile specified by externalProfile id.
 
     :param api: CaptivatePrimeAPI
     :param external_profile_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -46,6 +56,7 @@ def get_external_profile(
     return api.fetch(
         method="GET",
         endpoint=f"externalProfiles/{external_profile_id}",
+        **options,
     )
 
 
@@ -55,6 +66,7 @@ def get_all_users_of_external_profile(
     user_states: str | list = None,
     offset: int = 0,
     limit: int = 10,
+    **options,
 ) -> list:
     """Retrieves a list of enrolled users, which is subject to necessary
     permissions, for the mentioned external profile specified by the
@@ -65,6 +77,7 @@ def get_all_users_of_external_profile(
     :param user_states: str or list
     :param offset: int
     :param limit: int
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -103,9 +116,13 @@ def get_all_users_of_external_profile(
         method="GET",
         endpoint=f"externalProfiles/{external_profile_id}/users",
         params=params,
+        **options,
     )
 
 
+iter_all_users_of_external_profile = streaming(get_all_users_of_external_profile)
+
+
 def create_external_profile(
     api: CaptivatePrimeAPI,
 ) -> None:
@@ -3,12 +3,15 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_jobs(
     api: CaptivatePrimeAPI,
     offset: int = 0,
     limit: int = 10,
     sort: str = "id",
+    **options,
 ) -> list:
     """Jobs are requests for asynchronous task executions. Get the list of jobs
     submitted.
@@ -17,6 +20,7 @@ def get_all_jobs(
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -45,18 +49,24 @@ def get_all_jobs(
         method="GET",
         endpoint="jobs",
         params=params,
+        **options,
     )
 
 
+iter_all_jobs = streaming(get_all_jobs)
+
+
 def get_job(
     api: CaptivatePrimeAPI,
     job_id: str,
+    **options,
 ) -> list:
     """Get detailed information about the specified job like job type,
     dateCreated, dateCompleted and status. Refer to the job model.
 
     :param api: CaptivatePrimeAPI
     :param job_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -64,6 +74,7 @@ def get_job(
     return api.fetch(
         method="GET",
         endpoint=f"jobs/{job_id}",
+        **options,
     )
 
 
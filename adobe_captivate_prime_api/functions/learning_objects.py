@@ -3,6 +3,8 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_learning_objects(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
@@ -12,6 +14,7 @@ def get_all_learning_objects(  # pylint:disable=too-many-arguments
     sort: str = "name",
     lo_types: str | list = "course",
     ignore_enhanced_lp: bool = True,
+    **options,
 ) -> list:
     """Get the details of all the learning objects that Learner is enrolled,
     completed or enabled by the Admin.
@@ -24,6 +27,7 @@ def get_all_learning_objects(  # pylint:disable=too-many-arguments
     :param lo_types: str or list
     :param ignore_enhanced_lp: bool
     :type ignore_enhanced_lp: bool
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -84,13 +88,18 @@ def get_all_learning_objects(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint="learningObjects",
         params=params,
+        **options,
     )
 
 
+iter_all_learning_objects = streaming(get_all_learning_objects)
+
+
 def get_learning_object(
     api: CaptivatePrimeAPI,
     learning_object_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get detailed information of a learning object. It includes learning
     object creation date, published date, updated date, and so on. Refer to
@@ -99,6 +108,7 @@ def get_learning_object(
     :param api: CaptivatePrimeAPI
     :param learning_object_id: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -111,6 +121,7 @@ def get_learning_object(
         method="GET",
         endpoint=f"learningObjects/{learning_object_id}",
         params=params,
+        **options,
     )
 
 
@@ -118,6 +129,7 @@ def get_instance_summary_of_learning_object(
     api: CaptivatePrimeAPI,
     learning_object_id: str,
     learning_object_instance_id: str,
+    **options,
 ) -> list:
     """Retrieve miscellaneous information about a learningObject Instance viz.
     seatLimit, enrollmentCount, waitlistCount, completionCount.
@@ -125,6 +137,7 @@ def get_instance_summary_of_learning_object(
     :param api: CaptivatePrimeAPI
     :param learning_object_id: str
     :param learning_object_instance_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -133,4 +146,5 @@ def get_instance_summary_of_learning_object(
         method="GET",
         endpoint=f"learningObjects/{learning_object_id}"
         f"instances/{learning_object_instance_id}/summary",
+        **options,
     )
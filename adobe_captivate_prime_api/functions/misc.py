@@ -4,10 +4,12 @@ from adobe_captivate_prime_api import CaptivatePrimeAPI
 
 def get_account_info(
     api: CaptivatePrimeAPI,
+    **options,
 ) -> list:
     """Get detailed information for an account in your organization.
 
     :param api: CaptivatePrimeAPI
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return:
 
     """
@@ -15,17 +17,20 @@ def get_account_info(
     return api.fetch(
         method="GET",
         endpoint="account",
+        **options,
     )
 
 
 def check_elthor_support(
     api: CaptivatePrimeAPI,
     version: str,
+    **options,
 ) -> list:
     """Checks if a version of the elthor desktop app is supported.
 
     :param api: CaptivatePrimeAPI
     :param version: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -38,17 +43,20 @@ def check_elthor_support(
         method="GET",
         endpoint="elthor/check",
         params=params,
+        **options,
     )
 
 
 def get_user_info(
     api: CaptivatePrimeAPI,
     include: str,
+    **options,
 ) -> list:
     """Get the detailed information of the user who is currently logged in.
 
     :param api: CaptivatePrimeAPI
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -61,6 +69,7 @@ def get_user_info(
         method="GET",
         endpoint="user",
         params=params,
+        **options,
     )
 
 
@@ -3,6 +3,8 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_skills(
     api: CaptivatePrimeAPI,
@@ -10,6 +12,7 @@ def get_all_skills(
     limit: int = 10,
     sort: str = "name",
     include: str = None,
+    **options,
 ) -> list:
     """Get a list of all the skills for an account in your organization. It
     includes the skill name and description of each skill.
@@ -19,6 +22,7 @@ def get_all_skills(
     :param limit: int
     :param sort: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -46,13 +50,18 @@ def get_all_skills(
         method="GET",
         endpoint="skills",
         params=params,
+        **options,
     )
 
 
+iter_all_skills = streaming(get_all_skills)
+
+
 def get_skill(
     api: CaptivatePrimeAPI,
     skill_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get detailed information of any skill. It includes the skill name and
     description of the skill.
@@ -60,6 +69,7 @@ def get_skill(
     :param api: CaptivatePrimeAPI
     :param skill_id: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -72,6 +82,7 @@ def get_skill(
         method="GET",
         endpoint=f"skills/{skill_id}",
         params=params,
+        **options,
     )
 
 
@@ -81,6 +92,7 @@ def search_skill_interest(
     limit: int = 10,
     cursor: str = None,
     name_starts_with: str = None,
+    **options,
 ) -> list:
     """Retrieves a list of skill interest search results whose name contains
     the input query name.
@@ -90,6 +102,7 @@ def search_skill_interest(
     :param name_starts_with: str
     :param cursor: str
     :param limit: int
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -118,4 +131,8 @@ def search_skill_interest(
         method="GET",
         endpoint="skillInterest/search",
         params=params,
+        **options,
     )
+
+
+iter_search_skill_interest = streaming(search_skill_interest)
@@ -0,0 +1,46 @@
+"""Module providing ``streaming``, which builds the ``iter_*`` variant of a list
+function."""
+from collections.abc import (
+    Callable,
+    Iterator,
+)
+
+from adobe_captivate_prime_api import CaptivatePrimeAPI
+
+
+def streaming(function: Callable) -> Callable:
+    """Return the streaming variant of a list function, e.g. ``iter_all_users``
+    for ``get_all_users``: it calls ``function`` with ``stream=True`` and so
+    yields records as each page arrives instead of returning a list.
+
+    :param function: Callable, a function forwarding ``stream`` to ``fetch``
+    :return: Callable
+
+    """
+
+    def iter_records(api: CaptivatePrimeAPI, *args, **kwargs) -> Iterator[dict]:
+        """Call ``function`` with ``stream=True``; replaced below by a
+        docstring naming ``function``.
+
+        :param api: CaptivatePrimeAPI
+        :param args: forwarded to ``function``
+        :param kwargs: forwarded to ``function``
+        :return: Iterator[dict]
+
+        """
+
+        return function(api, *args, stream=True, **kwargs)
+
+    name = f"iter_{function.__name__.removeprefix('get_')}"
+    iter_records.__name__ = iter_records.__qualname__ = name
+    iter_records.__module__ = function.__module__
+    iter_records.__doc__ = (
+        f"Streaming variant of ``{function.__name__}``, yielding records as "
+        "each page arrives instead of returning a list.\n\n"
+        ":param api: CaptivatePrimeAPI\n"
+        f":param args: forwarded to ``{function.__name__}``\n"
+        f":param kwargs: forwarded to ``{function.__name__}``\n"
+        ":return: Iterator[dict]\n"
+    )
+
+    return iter_records
@@ -3,6 +3,8 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_user_groups(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
@@ -12,6 +14,7 @@ def get_all_user_groups(  # pylint:disable=too-many-arguments
     read_only: bool = None,
     states: str = None,
     catalog_id: str = None,
+    **options,
 ) -> list:
     """Get a list of User Groups for an account. It includes the user group
     name, description, state and so on.
@@ -23,6 +26,7 @@ def get_all_user_groups(  # pylint:disable=too-many-arguments
     :param catalog_id: str
     :param read_only: bool
     :param states: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -66,18 +70,24 @@ def get_all_user_groups(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint="userGroups",
         params=params,
+        **options,
     )
 
 
+iter_all_user_groups = streaming(get_all_user_groups)
+
+
 def get_user_group(
     api: CaptivatePrimeAPI,
     user_group_id: str = None,
+    **options,
 ) -> list:
     """Get detailed information of a single user group. It includes the user
     group name, description, state and so on.
 
     :param api: CaptivatePrimeAPI
     :param user_group_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -85,6 +95,7 @@ def get_user_group(
     return api.fetch(
         method="GET",
         endpoint=f"userGroups/{user_group_id}",
+        **options,
     )
 
 
@@ -94,6 +105,7 @@ def search_user_groups(
     cursor: str = None,
     sort: str = "name",
     name_starts_with: str = None,
+    **options,
 ) -> list:
     """Retrieves a list of User Groups search results whose name contains the
     input query name.
@@ -107,6 +119,7 @@ def search_user_groups(
     :type sort: str
     :param name_starts_with: str
     :type name_starts_with: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -134,9 +147,13 @@ def search_user_groups(
         method="GET",
         endpoint="userGroups/search",
         params=params,
+        **options,
     )
 
 
+iter_search_user_groups = streaming(search_user_groups)
+
+
 def get_child_user_groups_of_user_group(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
     user_group_id: str,
@@ -146,6 +163,7 @@ def get_child_user_groups_of_user_group(  # pylint:disable=too-many-arguments
     read_only: bool = None,
     states: str = None,
     catalog_id: str = None,
+    **options,
 ) -> list:
     """Get a list of immediate child User Groups within a User Group. It
     includes the user group name, description, state and so on.
@@ -158,6 +176,7 @@ def get_child_user_groups_of_user_group(  # pylint:disable=too-many-arguments
     :param catalog_id: str
     :param read_only: bool
     :param states: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -201,9 +220,13 @@ def get_child_user_groups_of_user_group(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"userGroups/{user_group_id}/userGroups",
         params=params,
+        **options,
     )
 
 
+iter_child_user_groups_of_user_group = streaming(get_child_user_groups_of_user_group)
+
+
 def get_all_users_of_user_group(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
     user_group_id: str,
@@ -211,6 +234,7 @@ def get_all_users_of_user_group(  # pylint:disable=too-many-arguments
     limit: int = 10,
     sort: str = "id",
     include: str = None,
+    **options,
 ) -> list:
     """Retrieves the list of users with the giver user group id.
 
@@ -221,6 +245,7 @@ def get_all_users_of_user_group(  # pylint:disable=too-many-arguments
     :param user_group_id: str
     :param include: str
     :type include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -250,9 +275,13 @@ def get_all_users_of_user_group(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"userGroups/{user_group_id}/users",
         params=params,
+        **options,
     )
 
 
+iter_all_users_of_user_group = streaming(get_all_users_of_user_group)
+
+
 def add_users_to_user_group(
     api: CaptivatePrimeAPI,
 ) -> None:
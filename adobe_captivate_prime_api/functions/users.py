@@ -3,6 +3,8 @@ import logging
 
 from adobe_captivate_prime_api import CaptivatePrimeAPI
 
+from .streaming import streaming
+
 
 def get_all_users(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
@@ -13,6 +15,7 @@ def get_all_users(  # pylint:disable=too-many-arguments
     sort: str = "id",
     user_filter: str = None,
     user_id: str = None,
+    **options,
 ) -> list:
     """Get the list of all the users available for your organization’s
     Captivate Prime account. It includes the list of all users with their
@@ -26,6 +29,7 @@ def get_all_users(  # pylint:disable=too-many-arguments
     :param limit: int
     :param sort: str
     :param user_id: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -70,13 +74,18 @@ def get_all_users(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint="users",
         params=params,
+        **options,
     )
 
 
+iter_all_users = streaming(get_all_users)
+
+
 def get_user(
     api: CaptivatePrimeAPI,
     user_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get the detailed information of any user for your account. It includes
     the user name, email-id, badges, points earned and so on.
@@ -84,6 +93,7 @@ def get_user(
     :param api: CaptivatePrimeAPI
     :param user_id: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -96,6 +106,7 @@ def get_user(
         method="GET",
         endpoint=f"users/{user_id}",
         params=params,
+        **options,
     )
 
 
@@ -106,6 +117,7 @@ def get_all_badges_of_user(  # pylint:disable=too-many-arguments
     cursor: str = None,
     sort: str = "dateAchieved",
     include: str = None,
+    **options,
 ) -> list:
     """Get a list of user badges for a user in your organization.
 
@@ -116,6 +128,7 @@ def get_all_badges_of_user(  # pylint:disable=too-many-arguments
     :param user_id: str
     :param include: str
     :type include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -143,14 +156,19 @@ def get_all_badges_of_user(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"users/{user_id}/userBadges",
         params=params,
+        **options,
     )
 
 
+iter_all_badges_of_user = streaming(get_all_badges_of_user)
+
+
 def get_badge_of_user(
     api: CaptivatePrimeAPI,
     user_id: str,
     badge_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get detailed information of a user badge. It includes id, type, badge
     name and learner name.
@@ -160,6 +178,7 @@ def get_badge_of_user(
     :param badge_id: str
     :param include: str
     :type include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return:
 
     """
@@ -172,6 +191,7 @@ def get_badge_of_user(
         method="GET",
         endpoint=f"users/{user_id}/userBadges/{badge_id}",
         params=params,
+        **options,
     )
 
 
@@ -181,6 +201,7 @@ def get_user_groups_of_user(
     offset: int = 0,
     limit: int = 10,
     sort: str = "name",
+    **options,
 ) -> list:
     """Get a list of User Groups for a User. It includes the user group name,
     description, state and so on.
@@ -190,6 +211,7 @@ def get_user_groups_of_user(
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -216,9 +238,13 @@ def get_user_groups_of_user(
         method="GET",
         endpoint=f"users/{user_id}/userGroups",
         params=params,
+        **options,
     )
 
 
+iter_user_groups_of_user = streaming(get_user_groups_of_user)
+
+
 def get_all_user_skills_of_user(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
     user_id: str,
@@ -226,6 +252,7 @@ def get_all_user_skills_of_user(  # pylint:disable=too-many-arguments
     offset: int = 0,
     limit: int = 10,
     sort: str = "dateAchieved",
+    **options,
 ) -> list:
     """Get detailed information of a user skill. It includes id, type, points
     earned, created and archived date.
@@ -236,6 +263,7 @@ def get_all_user_skills_of_user(  # pylint:disable=too-many-arguments
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -263,14 +291,19 @@ def get_all_user_skills_of_user(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"users/{user_id}/userSkills",
         params=params,
+        **options,
     )
 
 
+iter_all_user_skills_of_user = streaming(get_all_user_skills_of_user)
+
+
 def get_user_skill_of_user(
     api: CaptivatePrimeAPI,
     user_id: str,
     user_skills_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get detailed information of a user skill. It includes id, type, points
     earned, created and archived date.
@@ -279,6 +312,7 @@ def get_user_skill_of_user(
     :param user_id: str
     :param user_skills_id: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -291,6 +325,7 @@ def get_user_skill_of_user(
         method="GET",
         endpoint=f"users/{user_id}/userSkills/{user_skills_id}",
         params=params,
+        **options,
     )
 
 
@@ -303,6 +338,7 @@ def get_all_user_notifications_of_user(  # pylint:disable=too-many-arguments
     announcements_only: bool = False,
     language: str = "en_US",
     user_selected_channels: str | list = None,
+    **options,
 ) -> list:
     """Get the list of all the users available for your organization’s
     Captivate Prime account. It includes the list of all users with their
@@ -316,6 +352,7 @@ def get_all_user_notifications_of_user(  # pylint:disable=too-many-arguments
     :param announcements_only: bool
     :param language: str
     :param user_selected_channels: str or list
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -393,9 +430,13 @@ def get_all_user_notifications_of_user(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"users/{user_id}/userNotifications",
         params=params,
+        **options,
     )
 
 
+iter_all_user_notifications_of_user = streaming(get_all_user_notifications_of_user)
+
+
 def get_all_user_skill_interests_of_user(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
     user_id: str,
@@ -404,6 +445,7 @@ def get_all_user_skill_interests_of_user(  # pylint:disable=too-many-arguments
     offset: int = 0,
     limit: int = 10,
     sort: str = "dateAchieved",
+    **options,
 ) -> list:
     """Get detailed information of a user skill interest. It includes id,
     user_id, skill_id, created date and source of creation.
@@ -415,6 +457,7 @@ def get_all_user_skill_interests_of_user(  # pylint:disable=too-many-arguments
     :param offset: int
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -456,9 +499,13 @@ def get_all_user_skill_interests_of_user(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"users/{user_id}/skillInterests",
         params=params,
+        **options,
     )
 
 
+iter_all_user_skill_interests_of_user = streaming(get_all_user_skill_interests_of_user)
+
+
 def get_all_enrollments_of_user(  # pylint:disable=too-many-arguments
     api: CaptivatePrimeAPI,
     user_id: str,
@@ -468,6 +515,7 @@ def get_all_enrollments_of_user(  # pylint:disable=too-many-arguments
     sort: str = "name",
     lo_types: str | list = "course",
     states: str = None,
+    **options,
 ) -> list:
     """Get the details of all the learning objects that Learner is enrolled,
     completed or enabled by the Admin.
@@ -481,6 +529,7 @@ def get_all_enrollments_of_user(  # pylint:disable=too-many-arguments
     :param sort: str
     :param lo_types: str or list
     :param states: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -546,14 +595,19 @@ def get_all_enrollments_of_user(  # pylint:disable=too-many-arguments
         method="GET",
         endpoint=f"users/{user_id}/enrollments",
         params=params,
+        **options,
     )
 
 
+iter_all_enrollments_of_user = streaming(get_all_enrollments_of_user)
+
+
 def get_enrollment_of_user(
     api: CaptivatePrimeAPI,
     user_id: str,
     enrollment_id: str,
     include: str = None,
+    **options,
 ) -> list:
     """Get specific enrollment given user's id and enrollmentId.
 
@@ -561,6 +615,7 @@ def get_enrollment_of_user(
     :param user_id: str
     :param enrollment_id: str
     :param include: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -573,6 +628,7 @@ def get_enrollment_of_user(
         method="GET",
         endpoint=f"users/{user_id}/enrollments/{enrollment_id}",
         params=params,
+        **options,
     )
 
 
@@ -581,6 +637,7 @@ def get_all_accounts_of_email(
     email: str,
     only_active: bool = True,
     social_enabled_accounts: bool = False,
+    **options,
 ) -> list:
     """Get a list of all Captivate Prime accounts for a given email id. This
     API does not require an authentication check.
@@ -589,6 +646,7 @@ def get_all_accounts_of_email(
     :param email: str
     :param only_active: bool
     :param social_enabled_accounts: bool
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -602,9 +660,13 @@ def get_all_accounts_of_email(
         method="GET",
         endpoint=f"users/{email}/accounts",
         params=params,
+        **options,
     )
 
 
+iter_all_accounts_of_email = streaming(get_all_accounts_of_email)
+
+
 def get_all_user_badges_of_user_for_learning_object(  # pylint:disable=too-many-arguments,line-too-long  # noqa: E501
     api: CaptivatePrimeAPI,
     user_id: str,
@@ -613,6 +675,7 @@ def get_all_user_badges_of_user_for_learning_object(  # pylint:disable=too-many-
     cursor: str = None,
     limit: int = 10,
     sort: str = "name",
+    **options,
 ) -> list:
     """Get the details of all the learning objects that Learner is enrolled,
     completed or enabled by the Admin.
@@ -624,6 +687,7 @@ def get_all_user_badges_of_user_for_learning_object(  # pylint:disable=too-many-
     :param cursor: str
     :param limit: int
     :param sort: str
+    :param options: keyword arguments of ``CaptivatePrimeAPI.fetch``
     :return: list
 
     """
@@ -651,9 +715,15 @@ def get_all_user_badges_of_user_for_learning_object(  # pylint:disable=too-many-
         method="GET",
         endpoint=f"users/{user_id}/learningObjects/{learning_object_id}/userBadges",
         params=params,
+        **options,
     )
 
 
+iter_all_user_badges_of_user_for_learning_object = streaming(
+    get_all_user_badges_of_user_for_learning_object
+)
+
+
 def enroll_user_to_instance_of_learning_object(
     api: CaptivatePrimeAPI,
 ) -> None:
@@ -0,0 +1,106 @@
+"""This module provides ``IdentityMap`` which keeps JSON:API resources,
+including the ``included`` sideloads, unique by ``(type, id)`` so that
+relationships can be resolved without further requests."""
+
+import logging
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class IdentityMap:
+    """IdentityMap Class.
+
+    Stores every resource once per ``(type, id)``. A resource seen again is
+    merged into the stored one, so all records referring to it share the same
+    dict. Pass an instance as ``identity_map`` to ``CaptivatePrimeAPI.fetch``
+    (per call) or to the client (per session).
+
+    """
+
+    def __init__(self):
+        self.resources = {}
+
+    def add(self, resource: dict) -> dict:
+        """Store a resource and return the stored instance.
+
+        :param resource: dict
+        :return: dict
+
+        """
+
+        key = (resource["type"], resource["id"])
+        stored = self.resources.get(key)
+        if stored is None:
+            self.resources[key] = resource
+            return resource
+
+        if stored is not resource:
+            for member in ("attributes", "relationships", "links"):
+                if member in resource:
+                    stored.setdefault(member, {}).update(resource[member])
+
+        return stored
+
+    def add_document(self, r_json: dict) -> dict | list:
+        """Store the ``included`` resources and the primary data of a page.
+
+        :param r_json: dict
+        :return: the primary data made of the stored instances
+        :rtype: dict or list
+
+        """
+
+        for resource in r_json.get("included", []):
+            self.add(resource)
+
+        data = r_json.get("data")
+        if isinstance(data, list):
+            return [self.add(resource) for resource in data]
+        if isinstance(data, dict) and "type" in data:
+            return self.add(data)
+
+        return data
+
+    def get(self, resource_type: str, resource_id: str) -> dict | None:
+        """Return a stored resource.
+
+        :param resource_type: str
+        :param resource_id: str
+        :return: dict or None
+
+        """
+
+        return self.resources.get((resource_type, resource_id))
+
+    def resolve(self, record: dict, relationship: str) -> dict | list | None:
+        """Resolve a relationship of ``record`` from the stored resources.
+
+        To-one relationships return the related resource (or ``None``), to-many
+        relationships a list of the related resources that are known. Use
+        ``include=`` on the request to have them sideloaded.
+
+        :param record: dict
+        :param relationship: str
+        :return: dict, list or None
+
+        """
+
+        linkage = record.get("relationships", {}).get(relationship, {}).get("data")
+        if isinstance(linkage, list):
+            resources = (self.get(item["type"], item["id"]) for item in linkage)
+            return [resource for resource in resources if resource is not None]
+        if isinstance(linkage, dict):
+            return self.get(linkage["type"], linkage["id"])
+
+        return None
+
+    def clear(self) -> None:
+        """Forget every stored resource."""
+
+        self.resources.clear()
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.resources
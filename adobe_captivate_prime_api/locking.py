@@ -0,0 +1,129 @@
+"""This module provides ``FileLock``, an advisory inter-process lock used to
+coordinate workers sharing one configuration file."""
+
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+else:
+    msvcrt = None  # pylint:disable=invalid-name
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+LOCKS = {}
+LOCKS_LOCK = threading.Lock()
+
+
+def lock_fd(fd: int, blocking: bool) -> None:
+    """Lock the first byte of an open file exclusively. ``msvcrt.LK_LOCK``
+    gives up after about 10 seconds, so on Windows a blocking lock keeps
+    trying until it succeeds.
+
+    :param fd: int
+    :param blocking: bool
+    :raises OSError: the file is locked by another process (non-blocking).
+
+    """
+
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return
+
+    if not blocking:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return
+
+    while True:  # pragma: no cover - Windows
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            logging.debug("Still waiting for the lock on fd %s", fd)
+
+
+class FileLock:
+    """FileLock Class.
+
+    Exclusive lock on ``path`` shared by every process of the host. Within a
+    process the lock is reentrant for the owning thread and excludes other
+    threads, so nested sections (e.g. a config write during a token refresh)
+    never deadlock. Use ``file_lock`` to get the instance for a path.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquire the lock.
+
+        :param blocking: bool
+        :return: True/False, whether the lock has been acquired
+        :rtype: Boolean
+        :raises OSError: the lock file could not be opened or locked.
+
+        """
+
+        # pylint:disable-next=consider-using-with
+        if not self.thread_lock.acquire(blocking=blocking):
+            return False
+
+        if self.depth == 0:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                lock_fd(fd, blocking)
+            except OSError:
+                os.close(fd)
+                self.thread_lock.release()
+                if blocking:
+                    raise
+                return False
+            self.fd = fd
+
+        self.depth += 1
+        return True
+
+    def release(self) -> None:
+        """Release the lock."""
+
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+            os.close(self.fd)
+            self.fd = None
+
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def file_lock(path: str) -> FileLock:
+    """Return the process-wide ``FileLock`` for ``path``.
+
+    :param path: str
+    :return: FileLock
+
+    """
+
+    path = os.path.abspath(path)
+    with LOCKS_LOCK:
+        if path not in LOCKS:
+            LOCKS[path] = FileLock(path)
+
+        return LOCKS[path]
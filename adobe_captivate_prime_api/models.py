@@ -0,0 +1,313 @@
+"""This module provides compact typed models of the main Captivate Prime
+resources, an alternative to the raw JSON:API dicts returned by ``fetch``."""
+
+import logging
+import sys
+from datetime import datetime
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def parse_date(value: str | None) -> datetime | None:
+    """Parse a Prime API timestamp such as ``2021-01-29T11:45:43.000Z``.
+
+    :param value: str
+    :return: datetime or None
+
+    """
+
+    if not value:
+        return None
+
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class LazyDate:
+    """Descriptor parsing the raw timestamp kept in ``slot`` on first access
+    and storing the ``datetime`` back in its place."""
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.slot)
+        if isinstance(value, str):
+            value = parse_date(value)
+            setattr(instance, self.slot, value)
+
+        return value
+
+
+class Resource:
+    """Resource Class.
+
+    Base of the typed models. Each subclass lists its ``__slots__`` and maps
+    them to JSON:API attribute names in ``attribute_names``; attributes that
+    are not mapped are dropped. Values of ``interned`` slots (states, types)
+    are interned so that records share one string per distinct value, and
+    timestamps are kept raw until their ``LazyDate`` is read. Relationships
+    are reduced to ``(type, id)`` linkage.
+
+    """
+
+    __slots__ = ("id", "type", "relationships")
+
+    attribute_names = {}
+    interned = ()
+
+    def __init__(self, record: dict):
+        self.id = record["id"]
+        self.type = sys.intern(record["type"])
+
+        attributes = record.get("attributes", {})
+        for slot, name in self.attribute_names.items():
+            value = attributes.get(name)
+            if slot in self.interned and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, slot, value)
+
+        self.relationships = {}
+        for name, relationship in record.get("relationships", {}).items():
+            linkage = relationship.get("data")
+            if isinstance(linkage, list):
+                self.relationships[name] = [
+                    (sys.intern(item["type"]), item["id"]) for item in linkage
+                ]
+            elif isinstance(linkage, dict):
+                self.relationships[name] = (sys.intern(linkage["type"]), linkage["id"])
+
+    def related(self, name: str) -> tuple | list | None:
+        """Return the ``(type, id)`` linkage of a relationship, e.g. to look
+        the resource up in an ``IdentityMap``.
+
+        :param name: str
+        :return: tuple, list of tuples or None
+
+        """
+
+        return self.relationships.get(name)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id!r})"
+
+
+class User(Resource):
+    """User Class."""
+
+    __slots__ = (
+        "name",
+        "email",
+        "state",
+        "user_type",
+        "profile",
+        "roles",
+        "unique_id",
+        "points_earned",
+        "avatar_url",
+        "fields",
+    )
+
+    attribute_names = {
+        "name": "name",
+        "email": "email",
+        "state": "state",
+        "user_type": "userType",
+        "profile": "profile",
+        "roles": "roles",
+        "unique_id": "userUniqueId",
+        "points_earned": "pointsEarned",
+        "avatar_url": "avatarUrl",
+        "fields": "fields",
+    }
+    interned = ("state", "user_type", "profile")
+
+
+class Enrollment(Resource):
+    """Enrollment Class, a learning object instance enrollment."""
+
+    __slots__ = (
+        "state",
+        "lo_type",
+        "progress_percent",
+        "score",
+        "has_passed",
+        "_date_enrolled",
+        "_date_started",
+        "_date_completed",
+        "_completion_deadline",
+    )
+
+    attribute_names = {
+        "state": "state",
+        "lo_type": "loType",
+        "progress_percent": "progressPercent",
+        "score": "score",
+        "has_passed": "hasPassed",
+        "_date_enrolled": "dateEnrolled",
+        "_date_started": "dateStarted",
+        "_date_completed": "dateCompleted",
+        "_completion_deadline": "completionDeadline",
+    }
+    interned = ("state", "lo_type")
+
+    date_enrolled = LazyDate("_date_enrolled")
+    date_started = LazyDate("_date_started")
+    date_completed = LazyDate("_date_completed")
+    completion_deadline = LazyDate("_completion_deadline")
+
+
+class LearningObject(Resource):
+    """LearningObject Class."""
+
+    __slots__ = (
+        "lo_type",
+        "state",
+        "lo_format",
+        "enrollment_type",
+        "duration",
+        "tags",
+        "author_names",
+        "image_url",
+        "localized_metadata",
+        "_date_created",
+        "_date_published",
+        "_date_updated",
+    )
+
+    attribute_names = {
+        "lo_type": "loType",
+        "state": "state",
+        "lo_format": "loFormat",
+        "enrollment_type": "enrollmentType",
+        "duration": "duration",
+        "tags": "tags",
+        "author_names": "authorNames",
+        "image_url": "imageUrl",
+        "localized_metadata": "localizedMetadata",
+        "_date_created": "dateCreated",
+        "_date_published": "datePublished",
+        "_date_updated": "dateUpdated",
+    }
+    interned = ("lo_type", "state", "lo_format", "enrollment_type")
+
+    date_created = LazyDate("_date_created")
+    date_published = LazyDate("_date_published")
+    date_updated = LazyDate("_date_updated")
+
+    @property
+    def name(self) -> str | None:
+        """Name from the first ``localizedMetadata`` entry.
+
+        :return: str or None
+
+        """
+
+        for metadata in self.localized_metadata or []:  # pylint:disable=no-member
+            return metadata.get("name")
+
+        return None
+
+
+class UserGroup(Resource):
+    """UserGroup Class."""
+
+    __slots__ = (
+        "name",
+        "description",
+        "state",
+        "group_type",
+        "user_count",
+    )
+
+    attribute_names = {
+        "name": "name",
+        "description": "description",
+        "state": "state",
+        "group_type": "type",
+        "user_count": "userCount",
+    }
+    interned = ("state", "group_type")
+
+
+class Badge(Resource):
+    """Badge Class."""
+
+    __slots__ = (
+        "name",
+        "state",
+        "image_url",
+    )
+
+    attribute_names = {
+        "name": "name",
+        "state": "state",
+        "image_url": "imageUrl",
+    }
+    interned = ("state",)
+
+
+class Skill(Resource):
+    """Skill Class."""
+
+    __slots__ = (
+        "name",
+        "description",
+        "state",
+    )
+
+    attribute_names = {
+        "name": "name",
+        "description": "description",
+        "state": "state",
+    }
+    interned = ("state",)
+
+
+class Job(Resource):
+    """Job Class."""
+
+    __slots__ = (
+        "job_type",
+        "status",
+        "description",
+        "url",
+        "_date_created",
+    )
+
+    attribute_names = {
+        "job_type": "jobType",
+        "status": "status",
+        "description": "description",
+        "url": "url",
+        "_date_created": "dateCreated",
+    }
+    interned = ("job_type",)
+
+    date_created = LazyDate("_date_created")
+
+
+MODELS = {
+    "badge": Badge,
+    "job": Job,
+    "learningObject": LearningObject,
+    "learningObjectInstanceEnrollment": Enrollment,
+    "skill": Skill,
+    "user": User,
+    "userGroup": UserGroup,
+}
+
+
+def to_model(record: dict) -> Resource | dict:
+    """Build the model of a record, returning records of other types as is.
+
+    :param record: dict
+    :return: Resource or dict
+
+    """
+
+    model = MODELS.get(record.get("type"))
+
+    return record if model is None else model(record)
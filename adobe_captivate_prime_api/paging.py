@@ -0,0 +1,281 @@
+"""This module provides ``PagingPolicy`` which picks the ``page[limit]`` of
+paginated scans per endpoint instead of the fixed size passed by callers."""
+
+import logging
+import re
+import threading
+from urllib.parse import (
+    parse_qsl,
+    urlencode,
+    urlsplit,
+    urlunsplit,
+)
+
+from .cache import endpoint_of
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+LO_TYPES = ("course", "learningProgram", "jobAid", "certification")
+
+PARTITIONS = {  # pylint:disable=consider-using-namedtuple-or-dataclass
+    "learningObjects": ("filter.loTypes", LO_TYPES),
+    "users/enrollments": ("filter.loTypes", LO_TYPES),
+}
+
+ID_SEGMENT = re.compile(r"[0-9:@]")
+
+
+def route_of(url: str) -> str:
+    """Return the endpoint of a URL without its ids, e.g.
+    ``users/enrollments`` for ``users/123/enrollments`` or
+    ``learningObjects`` for ``learningObjects/course:1``. Ids are the segments
+    holding a digit, a ``:`` or an ``@``; named segments such as ``search``
+    in ``userGroups/search`` are kept.
+
+    :param url: str
+    :return: str
+
+    """
+
+    return "/".join(
+        segment
+        for segment in endpoint_of(url).split("/")
+        if not ID_SEGMENT.search(segment)
+    )
+
+
+def page_limit(url: str, params: dict = None) -> int | None:
+    """Return the ``page[limit]`` of a request, found in ``params`` or in the
+    query of ``url``.
+
+    :param url: str
+    :param params: dict
+    :return: int or None when not paginated
+
+    """
+
+    if params and params.get("page[limit]"):
+        return int(params["page[limit]"])
+
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key == "page[limit]" and value:
+            return int(value)
+
+    return None
+
+
+def split_partitions(url: str, params: dict, partitions) -> list[dict]:
+    """Split the parameters of a scan into disjoint partitions.
+
+    ``partitions`` is either a list of parameter overrides, one per partition
+    (e.g. ``[{"nameStartsWith": "a"}, {"nameStartsWith": "b"}]``), or
+    ``True`` for the partition key the endpoint declares in ``PARTITIONS``.
+    A declared key only splits the values the caller asked for, e.g. the
+    requested ``filter.loTypes``, and all of them otherwise. Keys are only
+    declared where their values cover every record of the plain scan and
+    nothing more; other endpoints need explicit partitions.
+
+    :param url: str
+    :param params: dict
+    :param partitions: list of dict or True
+    :type partitions: list or bool
+    :return: list of dict, the parameters of each partition
+
+    """
+
+    params = params or {}
+    if partitions is not True:
+        return [{**params, **partition} for partition in partitions]
+
+    if (route := route_of(url)) not in PARTITIONS:
+        logging.debug("No partition key declared for %s", route)
+        return [params]
+
+    key, values = PARTITIONS[route]
+    requested = params.get(key)
+    if isinstance(requested, str):
+        requested = requested.split(",")
+    if requested:
+        values = requested
+
+    return [{**params, key: value} for value in values] or [params]
+
+
+class PagingPolicy:  # pylint:disable=too-many-instance-attributes
+    """PagingPolicy Class.
+
+    Scans start with the largest page size of the endpoint (``max_sizes`` by
+    route such as ``users/enrollments`` or by resource such as ``users``,
+    ``max_size`` otherwise) and adapt it between pages: the size is halved
+    when a page takes longer than ``target_latency`` seconds or is larger
+    than ``max_bytes``, and doubled again when a page is well below both.
+
+    Page requests time out after ``timeout`` seconds, upon which the page is
+    requested again at half the size; once the size is down to ``min_size``
+    timed-out pages are retried through the client's retry policy instead.
+    A page size rejected by the API (400) steps down to the next common size.
+    Either way the new size is remembered as the endpoint's maximum.
+
+    """
+
+    steps = (1000, 500, 200, 100, 50, 25, 10)
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        max_size: int = 100,
+        max_sizes: dict = None,
+        min_size: int = 10,
+        target_latency: float = 2.0,
+        max_bytes: int = 4 * 1024 * 1024,
+        timeout: float = 30.0,
+        adaptive: bool = True,
+    ):
+        self.max_size = max_size
+        self.max_sizes = dict(max_sizes or {})
+        self.min_size = min_size
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.adaptive = adaptive
+        self.sizes = {}
+        self.lock = threading.Lock()
+
+    def limit(self, route: str) -> int:
+        """Largest page size of a route.
+
+        :param route: str
+        :return: int
+
+        """
+
+        resource = route.split("/", 1)[0]
+
+        return self.max_sizes.get(route, self.max_sizes.get(resource, self.max_size))
+
+    def size(self, route: str) -> int:
+        """Current page size of a route.
+
+        :param route: str
+        :return: int
+
+        """
+
+        with self.lock:
+            return self.sizes.get(route) or self.limit(route)
+
+    def apply(self, url: str, params: dict = None, max_size: int = None) -> tuple:
+        """Set the page size of a paginated request, found as ``page[limit]``
+        in ``params`` or in the query of ``url`` (``links.next``).
+
+        :param url: str
+        :param params: dict
+        :param max_size: int, cap on the size, e.g. the ``max_items`` of a scan
+        :return: (url, params, size), size is None when not paginated
+
+        """
+
+        size = self.size(route_of(url))
+        if max_size:
+            size = min(size, max_size)
+
+        if params and "page[limit]" in params:
+            return url, {**params, "page[limit]": size}, size
+
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if any(key == "page[limit]" for key, _ in query):
+            query = [
+                (key, str(size) if key == "page[limit]" else value)
+                for key, value in query
+            ]
+            return urlunsplit(parts._replace(query=urlencode(query))), params, size
+
+        return url, params, None
+
+    def observe(self, url: str, size: int, elapsed: float, nbytes: int) -> None:
+        """Adapt the page size of a route to a page just received.
+
+        :param url: str
+        :param size: int, page size that was requested
+        :param elapsed: float, seconds the page took
+        :param nbytes: int, size of the body
+
+        """
+
+        if not self.adaptive:
+            return
+
+        route = route_of(url)
+        if elapsed > self.target_latency or nbytes > self.max_bytes:
+            new_size = max(self.min_size, size // 2)
+        elif elapsed < self.target_latency / 2 and nbytes * 2 < self.max_bytes:
+            new_size = min(self.limit(route), size * 2)
+        else:
+            new_size = size
+
+        if new_size != size:
+            logging.debug("Page size of %s: %s -> %s", route, size, new_size)
+        with self.lock:
+            self.sizes[route] = new_size
+
+    def can_shrink(self, size: int) -> bool:
+        """Whether ``shrink`` can still lower a page size.
+
+        :param size: int
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        return max(self.min_size, size // 2) < size
+
+    def shrink(self, url: str, size: int) -> bool:
+        """Halve the page size of a route after a timeout; the page size will
+        not grow back above the new size.
+
+        :param url: str
+        :param size: int, page size that timed out
+        :return: True/False, False when the size is already the minimum
+        :rtype: Boolean
+
+        """
+
+        if not self.can_shrink(size):
+            return False
+
+        new_size = max(self.min_size, size // 2)
+        route = route_of(url)
+        logging.warning("Page of %s timed out, retrying with %s", route, new_size)
+        with self.lock:
+            self.max_sizes[route] = new_size
+            self.sizes[route] = new_size
+
+        return True
+
+    def reject(self, url: str, size: int, r_json: dict) -> bool:
+        """Lower the maximum page size of a route when the API rejected
+        ``size`` with a 400 error about the page limit.
+
+        :param url: str
+        :param size: int, page size that was sent
+        :param r_json: dict, the error document
+        :return: True/False, False for other errors or when no smaller size
+            is left
+        :rtype: Boolean
+
+        """
+
+        error = f"{r_json.get('title')} {r_json.get('source')}".lower()
+        smaller = [step for step in self.steps if step < size]
+        if "limit" not in error or not smaller or smaller[0] < self.min_size:
+            return False
+
+        route = route_of(url)
+        logging.warning(
+            "Page size %s rejected for %s, using %s", size, route, smaller[0]
+        )
+        with self.lock:
+            self.max_sizes[route] = smaller[0]
+            self.sizes[route] = smaller[0]
+
+        return True
@@ -0,0 +1,46 @@
+"""This module provides helpers shared by the synchronous and asynchronous
+clients to build requests."""
+
+from urllib.parse import (
+    parse_qsl,
+    urlencode,
+    urlsplit,
+)
+
+
+def normalize_params(params: dict = None) -> list:
+    """Flatten query parameters the way ``requests`` encodes them.
+
+    ``None`` values are dropped, lists become repeated keys and every value is
+    turned into a string, so the result can be handed to any HTTP client.
+
+    :param params: dict
+    :return: list of (key, value) tuples
+
+    """
+
+    pairs = []
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            pairs.append((key, str(item)))
+
+    return pairs
+
+
+def canonical_url(url: str, params: dict = None) -> str:
+    """Identify a GET request by its host, path and sorted query parameters,
+    merging the query string of ``url`` with ``params``.
+
+    :param url: str
+    :param params: dict
+    :return: str
+
+    """
+
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query = sorted(query + normalize_params(params))
+
+    return f"{parts.netloc}{parts.path}?{urlencode(query)}"
@@ -0,0 +1,152 @@
+"""This module provides ``iter_merged`` and ``aiter_merged`` which drain
+several page streams concurrently into one bounded queue, so producers run
+ahead of the consumer without unbounded buffering, and ``iter_prefetched``
+and ``aiter_prefetched`` which read a single stream ahead the same way."""
+
+import asyncio
+import logging
+import queue
+import threading
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterator,
+)
+from concurrent.futures import ThreadPoolExecutor
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+ITEM, DONE, ERROR = range(3)
+
+
+def iter_merged(
+    sources: list[Callable[[], Iterator]], workers: int, maxsize: int
+) -> Iterator:
+    """Yield the items of every source as they are produced.
+
+    Each source is a callable returning an iterator, drained on one of
+    ``workers`` threads. At most ``maxsize`` items wait in the queue, beyond
+    which producers block (backpressure). Items of one source keep their
+    order; an exception raised by a source is raised to the consumer. When
+    the consumer stops early, producers stop at their next item.
+
+    :param sources: list of callables returning iterators
+    :param workers: int
+    :param maxsize: int
+    :return: Iterator
+
+    """
+
+    items = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(message: tuple) -> bool:
+        """Queue ``message`` unless the consumer stopped meanwhile.
+
+        :param message: tuple
+        :return: True/False, False once the consumer stopped
+        :rtype: Boolean
+
+        """
+
+        while not stopped.is_set():
+            try:
+                items.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(source: Callable[[], Iterator]) -> None:
+        try:
+            for item in source():
+                if not put((ITEM, item)):
+                    return
+        except BaseException as e:  # pylint:disable=broad-except
+            put((ERROR, e))
+        else:
+            put((DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources))))
+    try:
+        for source in sources:
+            executor.submit(drain, source)
+        remaining = len(sources)
+        while remaining:
+            kind, item = items.get()
+            if kind == ITEM:
+                yield item
+            elif kind == DONE:
+                remaining -= 1
+            else:
+                raise item
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_prefetched(iterator: Iterator, size: int) -> Iterator:
+    """Yield the items of ``iterator`` while a background thread keeps up to
+    ``size`` of the next ones ready.
+
+    :param iterator: Iterator
+    :param size: int
+    :return: Iterator
+
+    """
+
+    return iter_merged([lambda: iterator], workers=1, maxsize=max(1, size))
+
+
+async def aiter_merged(
+    sources: list[Callable[[], AsyncIterator]], workers: int, maxsize: int
+) -> AsyncIterator:
+    """Asyncio counterpart of ``iter_merged``; sources are drained by tasks,
+    at most ``workers`` at a time.
+
+    :param sources: list of callables returning async iterators
+    :param workers: int
+    :param maxsize: int
+    :return: AsyncIterator
+
+    """
+
+    items = asyncio.Queue(maxsize=maxsize)
+    slots = asyncio.Semaphore(max(1, workers))
+
+    async def drain(source: Callable[[], AsyncIterator]) -> None:
+        async with slots:
+            try:
+                async for item in source():
+                    await items.put((ITEM, item))
+            except Exception as e:  # pylint:disable=broad-except
+                await items.put((ERROR, e))
+            else:
+                await items.put((DONE, None))
+
+    tasks = [asyncio.create_task(drain(source)) for source in sources]
+    try:
+        remaining = len(sources)
+        while remaining:
+            kind, item = await items.get()
+            if kind == ITEM:
+                yield item
+            elif kind == DONE:
+                remaining -= 1
+            else:
+                raise item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def aiter_prefetched(iterator: AsyncIterator, size: int) -> AsyncIterator:
+    """Asyncio counterpart of ``iter_prefetched``, reading ahead in a task.
+
+    :param iterator: AsyncIterator
+    :param size: int
+    :return: AsyncIterator
+
+    """
+
+    return aiter_merged([lambda: iterator], workers=1, maxsize=max(1, size))
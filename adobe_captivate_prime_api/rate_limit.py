@@ -0,0 +1,149 @@
+"""This module provides client-side token-bucket rate limiters that
+``CaptivatePrimeAPI`` consults before every request, so that aggregate traffic
+stays under the account-wide API throttle."""
+
+import logging
+import sqlite3
+import threading
+import time
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class TokenBucket:
+    """TokenBucket Class.
+
+    Allows ``rate`` requests per second on average and bursts of up to
+    ``burst`` requests. The bucket is shared by every thread using it.
+
+    Callers ``reserve`` a token and sleep for the returned delay, so waiting
+    works the same from threads and from an event loop, and callers are served
+    in the order in which they asked.
+
+    """
+
+    blocking = False
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.lock = threading.Lock()
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+
+    def take(self, tokens: float, updated_at: float, now: float) -> tuple:
+        """Refill ``tokens`` for the time elapsed since ``updated_at`` and take
+        one token out of the bucket. The balance may go negative, which means
+        the token is only valid after the returned delay.
+
+        :param tokens: float
+        :param updated_at: float
+        :param now: float
+        :return: (remaining tokens, delay in seconds)
+        :rtype: tuple
+
+        """
+
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate) - 1
+
+        return tokens, max(0.0, -tokens / self.rate)
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it.
+
+        :return: float
+
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens, delay = self.take(self.tokens, self.updated_at, now)
+            self.updated_at = now
+
+        return delay
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+
+        if delay := self.reserve():
+            logging.debug("Rate limited, waiting %.3fs", delay)
+            time.sleep(delay)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """SQLiteTokenBucket Class.
+
+    Token bucket kept in a SQLite database, so that every process on the host
+    pointing to the same ``path`` (and ``name``) shares one budget. Each
+    reservation is a short ``BEGIN IMMEDIATE`` transaction on a database in
+    WAL mode. Reservations may wait for other processes, so
+    ``AsyncCaptivatePrimeAPI`` makes them on a worker thread.
+
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        burst: int = 1,
+        name: str = "default",
+        timeout: float = 30.0,
+    ):
+        super().__init__(rate=rate, burst=burst)
+        self.path = path
+        self.name = name
+        self.timeout = timeout
+        self.local = threading.local()
+
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_bucket "
+                "(name TEXT PRIMARY KEY, tokens REAL, updated_at REAL)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the bucket database.
+
+        :return: sqlite3.Connection
+
+        """
+
+        if (connection := getattr(self.local, "connection", None)) is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+
+        return connection
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it.
+
+        :return: float
+
+        """
+
+        connection = self.connect()
+        connection.execute("BEGIN IMMEDIATE")
+        with connection:
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM token_bucket WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            tokens, updated_at = row if row else (float(self.burst), now)
+            tokens, delay = self.take(tokens, updated_at, now)
+            connection.execute(
+                "INSERT OR REPLACE INTO token_bucket (name, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+
+        return delay
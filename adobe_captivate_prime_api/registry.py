@@ -0,0 +1,106 @@
+"""This module provides ``ClientRegistry`` to serve many Captivate Prime
+accounts (tenants) from one process."""
+
+import logging
+import threading
+
+from .captivate_prime_api import CaptivatePrimeAPI
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class ClientRegistry:
+    """ClientRegistry Class.
+
+    Keeps one ``CaptivatePrimeAPI`` per tenant. Every client uses the
+    registry's connection pool, while tokens, credential store, rate limiter
+    and retry policy stay separate per tenant.
+
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ):
+        self.session = CaptivatePrimeAPI.create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+        )
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def register(self, tenant: str, **kwargs) -> CaptivatePrimeAPI:
+        """Create the client of a tenant.
+
+        ``kwargs`` are passed to ``CaptivatePrimeAPI``. Unless a ``store`` or
+        ``config_file`` is given, the tenant's settings are kept in
+        ``config.<tenant>.cfg``.
+
+        :param tenant: str
+        :param kwargs: forwarded to ``CaptivatePrimeAPI``
+        :return: CaptivatePrimeAPI
+        :raises KeyError: tenant is already registered.
+
+        """
+
+        with self.lock:
+            if tenant in self.clients:
+                raise KeyError(f"Tenant {tenant} is already registered")
+
+            if "store" not in kwargs and "config_file" not in kwargs:
+                kwargs["config_file"] = f"config.{tenant}.cfg"
+
+            client = CaptivatePrimeAPI(session=self.session, **kwargs)
+            self.clients[tenant] = client
+            logging.debug("Tenant %s registered", tenant)
+
+            return client
+
+    def get(self, tenant: str) -> CaptivatePrimeAPI:
+        """Return the client of a registered tenant.
+
+        :param tenant: str
+        :return: CaptivatePrimeAPI
+        :raises KeyError: tenant is not registered.
+
+        """
+
+        return self.clients[tenant]
+
+    def remove(self, tenant: str) -> None:
+        """Forget a tenant; the shared pool stays open.
+
+        :param tenant: str
+
+        """
+
+        with self.lock:
+            self.clients.pop(tenant, None)
+
+    def __getitem__(self, tenant: str) -> CaptivatePrimeAPI:
+        return self.get(tenant)
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self.clients
+
+    def __iter__(self):
+        return iter(list(self.clients))
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def close(self) -> None:
+        """Close the shared HTTP session of every tenant."""
+
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,118 @@
+"""This module provides ``RetryPolicy`` which decides when and how long
+``CaptivatePrimeAPI`` waits before repeating a failed request."""
+
+import logging
+import random
+from datetime import (
+    datetime,
+    timezone,
+)
+from email.utils import parsedate_to_datetime
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class RetryPolicy:
+    """RetryPolicy Class.
+
+    Retries throttled (429) and transient server (5xx) responses as well as
+    connection errors with exponential backoff and full jitter, honouring the
+    ``Retry-After`` header when the server sends one, up to ``max_backoff``
+    seconds. Only requests whose method is in ``methods`` are retried, since
+    repeating them is safe.
+
+    """
+
+    default_statuses = frozenset({429, 500, 502, 503, 504})
+    default_methods = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        max_attempts: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        jitter: bool = True,
+        statuses: set = None,
+        methods: set = None,
+        respect_retry_after: bool = True,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses or self.default_statuses)
+        self.methods = frozenset(
+            method.upper() for method in methods or self.default_methods
+        )
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(self, method: str, status_code: int = None) -> bool:
+        """Whether a request may be repeated. ``status_code`` is ``None`` for
+        connection errors and timeouts.
+
+        :param method: str
+        :param status_code: int
+        :return: True/False
+        :rtype: Boolean
+
+        """
+
+        if method.upper() not in self.methods:
+            return False
+
+        return status_code is None or status_code in self.statuses
+
+    def backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Seconds to wait before the next attempt, never more than
+        ``max_backoff``.
+
+        :param attempt: int, number of attempts made so far
+        :param retry_after: str, value of the ``Retry-After`` header
+        :return: float
+
+        """
+
+        if self.respect_retry_after:
+            if (seconds := self.parse_retry_after(retry_after)) is not None:
+                if seconds > self.max_backoff:
+                    logging.warning(
+                        "Retry-After of %.0fs capped to %.0fs",
+                        seconds,
+                        self.max_backoff,
+                    )
+                return min(seconds, self.max_backoff)
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: str = None) -> float | None:
+        """Parse a ``Retry-After`` header given either in seconds or as an
+        HTTP date.
+
+        :param value: str
+        :return: float or None
+
+        """
+
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            logging.debug("Invalid Retry-After header: %s", value)
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,758 @@
+"""This module provides the scans of ``CaptivatePrimeAPI`` and
+``AsyncCaptivatePrimeAPI``: ``iter_documents`` and ``aiter_documents`` pick
+the page stream of a scan (offset windows, partitions or the client's
+``iter_pages``) and chain read-ahead, deduplication, checkpoints and early
+stops onto it with the page helpers below."""
+
+import asyncio
+import functools
+import logging
+from collections import deque
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterator,
+)
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import (
+    BaseCaptivatePrimeAPI,
+    run_blocking,
+)
+from .checkpoint import Checkpoint
+from .codec import (
+    loads,
+    next_link,
+)
+from .identity_map import IdentityMap
+from .models import (
+    Resource,
+    to_model,
+)
+from .paging import (
+    route_of,
+    split_partitions,
+)
+from .params import canonical_url
+from .pipeline import (
+    aiter_merged,
+    aiter_prefetched,
+    iter_merged,
+    iter_prefetched,
+)
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def dedupe_pages(pages: Iterator[dict]) -> Iterator[dict]:
+    """Drop records whose ``id`` appeared on an earlier page.
+
+    :param pages: Iterator[dict]
+    :return: Iterator[dict]
+
+    """
+
+    seen = set()
+    for page in pages:
+        if isinstance(page.get("data"), list):
+            records = []
+            for record in page["data"]:
+                if record["id"] not in seen:
+                    seen.add(record["id"])
+                    records.append(record)
+            page["data"] = records
+        yield page
+
+
+def truncate_page(
+    page: dict, max_items: int = None, take_while: Callable[[dict], bool] = None
+) -> tuple[dict, bool]:
+    """Cut the records of a page at ``max_items`` or at the first record for
+    which ``take_while`` is false.
+
+    :param page: dict
+    :param max_items: int
+    :param take_while: callable
+    :return: (page, stop), stop is True when the scan should end here
+
+    """
+
+    records = page.get("data")
+    if not isinstance(records, list):
+        return page, False
+
+    stop = False
+    if take_while is not None:
+        for index, record in enumerate(records):
+            if not take_while(record):
+                records, stop = records[:index], True
+                break
+    if max_items is not None and len(records) >= max_items:
+        records, stop = records[:max_items], True
+    page["data"] = records
+
+    return page, stop
+
+
+def advance_checkpoint(  # pylint:disable=too-many-arguments
+    page: dict | bytes,
+    checkpoint: Checkpoint,
+    key: str,
+    state: dict,
+    json_loads: Callable = loads,
+) -> None:
+    """Record a completed page in ``state``, saving it every
+    ``checkpoint.every`` pages and clearing the checkpoint after the last
+    page.
+
+    :param page: dict or bytes
+    :param checkpoint: Checkpoint
+    :param key: str
+    :param state: dict
+    :param json_loads: callable decoding bytes
+
+    """
+
+    if isinstance(page, bytes):
+        link = next_link(page, json_loads)
+    else:
+        link = (page.get("links") or {}).get("next")
+        if isinstance(page.get("data"), list):
+            state["records"] += len(page["data"])
+    state["pages"] += 1
+    state["next"] = link
+
+    if link is None:
+        checkpoint.clear(key)
+    elif state["pages"] % checkpoint.every == 0:
+        checkpoint.save(key, state)
+
+
+def checkpoint_pages(  # pylint:disable=too-many-arguments
+    pages: Iterator[dict | bytes],
+    checkpoint: Checkpoint,
+    key: str,
+    state: dict = None,
+    json_loads: Callable = loads,
+) -> Iterator[dict | bytes]:
+    """Yield pages, recording each one with ``advance_checkpoint`` once the
+    consumer asks for what follows it. ``state`` is the progress the scan
+    resumed from.
+
+    :param pages: Iterator[dict | bytes]
+    :param checkpoint: Checkpoint
+    :param key: str
+    :param state: dict
+    :param json_loads: callable decoding bytes
+    :return: Iterator[dict | bytes]
+
+    """
+
+    state = {"next": None, "pages": 0, "records": 0, **(state or {})}
+    for page in pages:
+        yield page
+        advance_checkpoint(page, checkpoint, key, state, json_loads)
+
+
+def take_pages(
+    pages: Iterator[dict],
+    max_items: int = None,
+    take_while: Callable[[dict], bool] = None,
+    on_stop: Callable[[], None] = None,
+) -> Iterator[dict]:
+    """Yield pages until ``max_items`` records were yielded or ``take_while``
+    returns a false value for a record, then close ``pages`` so that no
+    further page is requested and call ``on_stop``.
+
+    :param pages: Iterator[dict]
+    :param max_items: int
+    :param take_while: callable
+    :param on_stop: callable, called when the scan stopped early
+    :return: Iterator[dict]
+
+    """
+
+    remaining, stop = max_items, False
+    try:
+        for page in pages:
+            page, stop = truncate_page(page, remaining, take_while)
+            if isinstance(page.get("data"), list) and remaining is not None:
+                remaining -= len(page["data"])
+            yield page
+            if stop:
+                break
+    finally:
+        pages.close()
+    if stop and on_stop is not None:
+        on_stop()
+
+
+def limit_params(params: dict | None, max_items: int = None) -> dict | None:
+    """Lower the ``page[limit]`` of ``params`` to ``max_items``, so that a
+    scan stopping early does not request a larger page than it needs.
+
+    :param params: dict
+    :param max_items: int
+    :return: dict
+
+    """
+
+    limit = (params or {}).get("page[limit]")
+    if max_items and isinstance(limit, int) and limit > max_items:
+        return {**params, "page[limit]": max_items}
+
+    return params
+
+
+def page_records(
+    document: dict,
+    pages: bool = False,
+    models: bool = False,
+    identity_map: IdentityMap = None,
+) -> Iterator[dict | Resource]:
+    """Yield what ``iter_fetch`` returns for one decoded page: the page itself
+    with ``pages``, its records otherwise, as ``Resource`` objects with
+    ``models``. With an ``identity_map`` the resources of the page are added
+    to it first and the records it returns are yielded.
+
+    :param document: dict
+    :param pages: bool
+    :param models: bool
+    :param identity_map: IdentityMap
+    :return: Iterator[dict | Resource]
+
+    """
+
+    if identity_map is not None:
+        document["data"] = identity_map.add_document(document)
+    data = document["data"]
+
+    if pages:
+        yield document
+    elif models and isinstance(data, list):
+        yield from map(to_model, data)
+    elif models and isinstance(data, dict):
+        yield to_model(data)
+    elif isinstance(data, list):
+        yield from data
+    elif identity_map is not None:
+        yield data
+    elif isinstance(data, dict):
+        yield dict(data)
+
+
+def iter_documents(  # pylint:disable=too-many-arguments
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict = None,
+    raw: bool = False,
+    parallel: int = None,
+    partitions: list | bool = None,
+    dedupe: bool = False,
+    prefetch: int = None,
+    max_items: int = None,
+    take_while: Callable[[dict], bool] = None,
+    checkpoint: Checkpoint = None,
+) -> Iterator[dict | bytes]:
+    """Yield the pages of a scan: from ``iter_partitioned_pages`` with
+    ``partitions``, from ``iter_offset_pages`` when ``parallel`` is set and
+    the endpoint takes ``page[offset]``, from ``api.iter_pages`` otherwise.
+    A scan with a saved ``checkpoint`` starts from its ``next`` URL instead,
+    counting the records it already yielded towards ``max_items``; a scan
+    stopped by ``max_items`` or ``take_while`` clears its checkpoint, so the
+    next one starts over.
+
+    :param api: CaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param raw: bool
+    :param parallel: int
+    :param partitions: list of dict or True
+    :param dedupe: bool, drop records already yielded (decoded pages only)
+    :param prefetch: int, number of pages read ahead of the consumer
+    :param max_items: int, number of records after which the scan stops
+    :param take_while: callable, the scan stops at the first record for
+        which it returns a false value
+    :param checkpoint: Checkpoint, resume from and save the progress
+    :return: Iterator[dict | bytes]
+    :raises ValueError: a partitioned scan was given a ``checkpoint``.
+
+    """
+
+    state = on_stop = None
+    if checkpoint is not None:
+        if partitions:
+            raise ValueError("Partitioned scans cannot be checkpointed.")
+        key = canonical_url(url, params)
+        state = checkpoint.load(key)
+        on_stop = functools.partial(checkpoint.clear, key)
+        if state and state.get("next"):
+            logging.info("Resuming %s after %s pages", url, state.get("pages", 0))
+            url, params = state["next"], None
+            if max_items is not None:
+                max_items = max(0, max_items - state.get("records", 0))
+
+    params = limit_params(params, max_items)
+
+    if partitions:
+        documents = iter_partitioned_pages(
+            api,
+            url=url,
+            params=params,
+            partitions=partitions,
+            workers=parallel,
+            raw=raw,
+            max_size=max_items,
+        )
+    elif parallel and params and "page[offset]" in params:
+        documents = iter_offset_pages(
+            api,
+            url=url,
+            params=params,
+            workers=parallel,
+            raw=raw,
+            max_size=max_items,
+        )
+    else:
+        documents = api.iter_pages(url=url, params=params, raw=raw, max_size=max_items)
+
+    if prefetch:
+        documents = iter_prefetched(documents, prefetch)
+    if dedupe and not raw:
+        documents = dedupe_pages(documents)
+    if checkpoint is not None:
+        documents = checkpoint_pages(
+            documents, checkpoint, key, state, json_loads=api.json_loads
+        )
+    if (max_items is not None or take_while is not None) and not raw:
+        documents = take_pages(documents, max_items, take_while, on_stop)
+
+    return documents
+
+
+def iter_partitioned_pages(  # pylint:disable=too-many-arguments
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict,
+    partitions: list | bool,
+    workers: int = None,
+    raw: bool = False,
+    max_size: int = None,
+) -> Iterator[dict | bytes]:
+    """Yield the pages of a scan split by ``paging.split_partitions``, one
+    cursor stream per partition and up to ``workers`` streams (all of them
+    by default) at the same time. Pages are yielded as they arrive, so the
+    order across partitions is not defined.
+
+    :param api: CaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param partitions: list of dict or True
+    :param workers: int
+    :param raw: bool
+    :param max_size: int, cap on the paging policy's page size
+    :return: Iterator[dict | bytes]
+
+    """
+
+    sources = [
+        functools.partial(
+            api.iter_pages, url=url, params=partition, raw=raw, max_size=max_size
+        )
+        for partition in split_partitions(url, params, partitions)
+    ]
+
+    return iter_merged(
+        sources, workers=workers or len(sources), maxsize=2 * len(sources)
+    )
+
+
+def iter_offset_pages(  # pylint:disable=too-many-arguments
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict,
+    workers: int,
+    raw: bool = False,
+    max_size: int = None,
+) -> Iterator[dict | bytes]:
+    """Yield the pages of an endpoint paginated by ``page[offset]``,
+    requesting up to ``workers`` offset windows at the same time.
+
+    Windows are ``page[limit]`` (or the paging policy's size, at most
+    ``max_size``) apart and
+    pages are yielded in offset order. The scan stops after the first page
+    that is short, empty or has no ``links.next``; windows past it that
+    are already in flight are discarded. When the API rejects the page
+    size, the windows from the failed one on are requested again at the
+    paging policy's lowered size.
+
+    :param api: CaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param workers: int
+    :param raw: bool
+    :param max_size: int
+    :return: Iterator[dict | bytes]
+    :raises RuntimeError: a window failed before the last page.
+
+    """
+
+    limit = int(params.get("page[limit]") or 10)
+    if api.paging is not None:
+        limit = api.paging.size(route_of(url))
+        if max_size:
+            limit = min(limit, max_size)
+    offset = int(params.get("page[offset]") or 0)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    windows = deque()
+    try:
+        while True:
+            while len(windows) < workers:
+                window = {**params, "page[offset]": offset, "page[limit]": limit}
+                windows.append(executor.submit(first_page, api, url, window, raw))
+                offset += limit
+            start = offset - len(windows) * limit
+            if (page := windows.popleft().result()) is None:
+                limit = rejected_limit(api, url, start, limit)
+                for window in windows:
+                    window.cancel()
+                windows.clear()
+                offset = start
+                continue
+            yield page
+            if api.is_last_page(page, limit):
+                return
+    finally:
+        for window in windows:
+            window.cancel()
+        executor.shutdown(wait=False)
+
+
+def rejected_limit(
+    api: BaseCaptivatePrimeAPI, url: str, offset: int, limit: int
+) -> int:
+    """Return the page size to request an offset window with again after it
+    failed, which is only possible when the API rejected ``limit`` and the
+    paging policy lowered it.
+
+    :param api: CaptivatePrimeAPI or AsyncCaptivatePrimeAPI
+    :param url: str
+    :param offset: int, offset of the failed window
+    :param limit: int, page size of the failed window
+    :return: int
+    :raises RuntimeError: the window failed for another reason.
+
+    """
+
+    if api.paging is None or (size := api.paging.size(route_of(url))) >= limit:
+        raise RuntimeError(f"Page at offset {offset} failed: {url}")
+
+    logging.info("Requesting %s again from offset %s by %s", url, offset, size)
+
+    return size
+
+
+def first_page(
+    api: BaseCaptivatePrimeAPI, url: str, params: dict = None, raw: bool = False
+) -> dict | bytes | None:
+    """Return the first page of a request as given, without following
+    ``links.next`` or applying the paging policy.
+
+    :param api: CaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param raw: bool
+    :return: dict, bytes or None when the request failed
+
+    """
+
+    pages = api.iter_pages(url=url, params=params, raw=raw, adaptive=False)
+    try:
+        return next(pages, None)
+    finally:
+        pages.close()
+
+
+async def adedupe_pages(pages: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """Async counterpart of ``dedupe_pages``.
+
+    :param pages: AsyncIterator[dict]
+    :return: AsyncIterator[dict]
+
+    """
+
+    seen = set()
+    async for page in pages:
+        if isinstance(page.get("data"), list):
+            records = []
+            for record in page["data"]:
+                if record["id"] not in seen:
+                    seen.add(record["id"])
+                    records.append(record)
+            page["data"] = records
+        yield page
+
+
+async def acheckpoint_pages(  # pylint:disable=too-many-arguments
+    pages: AsyncIterator[dict | bytes],
+    checkpoint: Checkpoint,
+    key: str,
+    state: dict = None,
+    json_loads: Callable = loads,
+) -> AsyncIterator[dict | bytes]:
+    """Async counterpart of ``checkpoint_pages``, recording pages on a worker
+    thread when ``checkpoint.blocking`` is set.
+
+    :param pages: AsyncIterator[dict | bytes]
+    :param checkpoint: Checkpoint
+    :param key: str
+    :param state: dict
+    :param json_loads: callable decoding bytes
+    :return: AsyncIterator[dict | bytes]
+
+    """
+
+    state = {"next": None, "pages": 0, "records": 0, **(state or {})}
+    async for page in pages:
+        yield page
+        await run_blocking(
+            advance_checkpoint,
+            page,
+            checkpoint,
+            key,
+            state,
+            json_loads,
+            blocking=checkpoint.blocking,
+        )
+
+
+async def atake_pages(
+    pages: AsyncIterator[dict],
+    max_items: int = None,
+    take_while: Callable[[dict], bool] = None,
+    on_stop: Callable[[], None] = None,
+) -> AsyncIterator[dict]:
+    """Async counterpart of ``take_pages``.
+
+    :param pages: AsyncIterator[dict]
+    :param max_items: int
+    :param take_while: callable
+    :param on_stop: coroutine function
+    :return: AsyncIterator[dict]
+
+    """
+
+    remaining, stop = max_items, False
+    try:
+        async for page in pages:
+            page, stop = truncate_page(page, remaining, take_while)
+            if isinstance(page.get("data"), list) and remaining is not None:
+                remaining -= len(page["data"])
+            yield page
+            if stop:
+                break
+    finally:
+        await pages.aclose()
+    if stop and on_stop is not None:
+        await on_stop()
+
+
+async def aiter_documents(  # pylint:disable=too-many-arguments,too-many-locals
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict = None,
+    raw: bool = False,
+    parallel: int = None,
+    partitions: list | bool = None,
+    dedupe: bool = False,
+    prefetch: int = None,
+    max_items: int = None,
+    take_while: Callable[[dict], bool] = None,
+    checkpoint: Checkpoint = None,
+) -> AsyncIterator[dict | bytes]:
+    """Async counterpart of ``iter_documents``; checkpoints with
+    ``blocking`` set are loaded, saved and cleared on a worker thread.
+
+    :param api: AsyncCaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param raw: bool
+    :param parallel: int
+    :param partitions: list of dict or True
+    :param dedupe: bool, drop records already yielded (decoded pages only)
+    :param prefetch: int, number of pages read ahead of the consumer
+    :param max_items: int, number of records after which the scan stops
+    :param take_while: callable, the scan stops at the first record for
+        which it returns a false value
+    :param checkpoint: Checkpoint, resume from and save the progress
+    :return: AsyncIterator[dict | bytes]
+    :raises ValueError: a partitioned scan was given a ``checkpoint``.
+
+    """
+
+    state = on_stop = None
+    if checkpoint is not None:
+        if partitions:
+            raise ValueError("Partitioned scans cannot be checkpointed.")
+        key = canonical_url(url, params)
+        state = await run_blocking(checkpoint.load, key, blocking=checkpoint.blocking)
+        on_stop = functools.partial(
+            run_blocking, checkpoint.clear, key, blocking=checkpoint.blocking
+        )
+        if state and state.get("next"):
+            logging.info("Resuming %s after %s pages", url, state.get("pages", 0))
+            url, params = state["next"], None
+            if max_items is not None:
+                max_items = max(0, max_items - state.get("records", 0))
+
+    params = limit_params(params, max_items)
+
+    if partitions:
+        documents = aiter_partitioned_pages(
+            api,
+            url=url,
+            params=params,
+            partitions=partitions,
+            workers=parallel,
+            raw=raw,
+            max_size=max_items,
+        )
+    elif parallel and params and "page[offset]" in params:
+        documents = aiter_offset_pages(
+            api,
+            url=url,
+            params=params,
+            workers=parallel,
+            raw=raw,
+            max_size=max_items,
+        )
+    else:
+        documents = api.iter_pages(url=url, params=params, raw=raw, max_size=max_items)
+
+    if prefetch:
+        documents = aiter_prefetched(documents, prefetch)
+    if dedupe and not raw:
+        documents = adedupe_pages(documents)
+    if checkpoint is not None:
+        documents = acheckpoint_pages(
+            documents, checkpoint, key, state, json_loads=api.json_loads
+        )
+    if (max_items is not None or take_while is not None) and not raw:
+        documents = atake_pages(documents, max_items, take_while, on_stop)
+
+    try:
+        async for document in documents:
+            yield document
+    finally:
+        await documents.aclose()
+
+
+def aiter_partitioned_pages(  # pylint:disable=too-many-arguments
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict,
+    partitions: list | bool,
+    workers: int = None,
+    raw: bool = False,
+    max_size: int = None,
+) -> AsyncIterator[dict | bytes]:
+    """Async counterpart of ``iter_partitioned_pages``.
+
+    :param api: AsyncCaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param partitions: list of dict or True
+    :param workers: int
+    :param raw: bool
+    :param max_size: int
+    :return: AsyncIterator[dict | bytes]
+
+    """
+
+    sources = [
+        functools.partial(
+            api.iter_pages, url=url, params=partition, raw=raw, max_size=max_size
+        )
+        for partition in split_partitions(url, params, partitions)
+    ]
+
+    return aiter_merged(
+        sources, workers=workers or len(sources), maxsize=2 * len(sources)
+    )
+
+
+async def aiter_offset_pages(  # pylint:disable=too-many-arguments
+    api: BaseCaptivatePrimeAPI,
+    url: str,
+    params: dict,
+    workers: int,
+    raw: bool = False,
+    max_size: int = None,
+) -> AsyncIterator[dict | bytes]:
+    """Yield the pages of an endpoint paginated by ``page[offset]``,
+    requesting up to ``workers`` offset windows at the same time, in
+    offset order; see ``iter_offset_pages``.
+
+    :param api: AsyncCaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param workers: int
+    :param raw: bool
+    :param max_size: int
+    :return: AsyncIterator[dict | bytes]
+    :raises RuntimeError: a window failed before the last page.
+
+    """
+
+    limit = int(params.get("page[limit]") or 10)
+    if api.paging is not None:
+        limit = api.paging.size(route_of(url))
+        if max_size:
+            limit = min(limit, max_size)
+    offset = int(params.get("page[offset]") or 0)
+
+    windows = deque()
+    try:
+        while True:
+            while len(windows) < workers:
+                window = {**params, "page[offset]": offset, "page[limit]": limit}
+                windows.append(asyncio.create_task(afirst_page(api, url, window, raw)))
+                offset += limit
+            start = offset - len(windows) * limit
+            if (page := await windows.popleft()) is None:
+                limit = rejected_limit(api, url, start, limit)
+                for window in windows:
+                    window.cancel()
+                windows.clear()
+                offset = start
+                continue
+            yield page
+            if api.is_last_page(page, limit):
+                return
+    finally:
+        for window in windows:
+            window.cancel()
+
+
+async def afirst_page(
+    api: BaseCaptivatePrimeAPI, url: str, params: dict = None, raw: bool = False
+) -> dict | bytes | None:
+    """Return the first page of a request as given, without following
+    ``links.next`` or applying the paging policy.
+
+    :param api: AsyncCaptivatePrimeAPI
+    :param url: str
+    :param params: dict
+    :param raw: bool
+    :return: dict, bytes or None when the request failed
+
+    """
+
+    pages = api.iter_pages(url=url, params=params, raw=raw, adaptive=False)
+    try:
+        async for page in pages:
+            return page
+        return None
+    finally:
+        await pages.aclose()
@@ -0,0 +1,207 @@
+"""This module provides the credential stores ``CaptivatePrimeAPI`` keeps its
+application settings and tokens in."""
+
+import configparser
+import logging
+import os
+import tempfile
+import threading
+
+from .locking import file_lock
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class CredentialStore:
+    """CredentialStore Class.
+
+    Keeps the ``CAPTIVATE`` (application and tokens) and ``APP`` (token
+    bookkeeping) sections in memory only, so a client can be built without
+    touching the disk. Subclasses persist the values; changes are collected
+    and only written by ``flush`` when a value actually changed.
+
+    ``reload`` and ``flush`` take ``lock``, while ``read`` and ``write`` do
+    the same for a caller already holding it. Stores whose I/O blocks set
+    ``blocking``, so that ``AsyncCaptivatePrimeAPI`` runs it on a worker
+    thread.
+
+    """
+
+    blocking = False
+
+    sections = {
+        "CAPTIVATE": (
+            "server_instance",
+            "application_id",
+            "application_secret",
+            "application_url",
+            "application_scopes",
+            "access_token",
+            "refresh_token",
+        ),
+        "APP": (
+            "account_id",
+            "user_id",
+            "user_role",
+            "checked_at",
+            "refreshed_at",
+            "expires_on",
+        ),
+    }
+
+    def __init__(self, values: dict = None):
+        self.parser = configparser.ConfigParser()
+        for section, options in self.sections.items():
+            self.parser[section] = {option: "" for option in options}
+        for section, options in (values or {}).items():
+            for option, value in options.items():
+                self.parser.set(section=section, option=option, value=str(value))
+        self.dirty = False
+        self.thread_lock = threading.RLock()
+
+    def get(self, section: str, option: str) -> str | None:
+        """Return a value, ``None`` when it is not set.
+
+        :param section: str
+        :param option: str
+        :return: str or None
+
+        """
+
+        value = self.parser.get(section=section, option=option, fallback="")
+
+        return None if value in ("", "None") else value
+
+    def set(self, section: str, option: str, value) -> None:
+        """Set a value; the store only becomes dirty when the value changed.
+
+        :param section: str
+        :param option: str
+        :param value: str
+        :type value: str, int, float or None
+
+        """
+
+        value = "" if value is None else str(value)
+        if not self.parser.has_section(section):
+            self.parser.add_section(section)
+        if self.parser.get(section=section, option=option, fallback=None) != value:
+            self.parser.set(section=section, option=option, value=value)
+            self.dirty = True
+            logging.debug('Config updated with "%s = %s"', option, value)
+
+    def update(self, section: str, values: dict) -> None:
+        """Set several values of one section.
+
+        :param section: str
+        :param values: dict
+
+        """
+
+        for option, value in values.items():
+            self.set(section=section, option=option, value=value)
+
+    def lock(self):
+        """Return the lock that serialises token refreshes and writes.
+
+        :return: threading.RLock
+        :rtype: threading.RLock
+
+        """
+
+        return self.thread_lock
+
+    def reload(self) -> None:
+        """Re-read persisted values under ``lock``."""
+
+        with self.lock():
+            self.read()
+
+    def flush(self) -> None:
+        """Persist pending changes under ``lock`` if any value changed.
+
+        :raise RuntimeError: error while writing the changes.
+
+        """
+
+        if not self.dirty:
+            return
+
+        with self.lock():
+            self.write()
+
+    def read(self) -> None:
+        """Re-read persisted values; nothing to do for an in-memory store."""
+
+    def write(self) -> None:
+        """Persist pending changes; nothing to do for an in-memory store."""
+
+        self.dirty = False
+
+
+class ConfigFileStore(CredentialStore):
+    """ConfigFileStore Class.
+
+    Persists the sections to an INI file such as ``config.cfg``. Writes go to
+    a temporary file that atomically replaces the config, and reads and writes
+    hold ``file_lock`` on ``<path>.lock`` so concurrent workers never see a
+    torn file.
+
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = "config.cfg"):
+        super().__init__()
+        self.path = path
+        if os.path.exists(self.path):
+            self.reload()
+        else:
+            logging.error(
+                "Configuration file is not valid, please provide a valid %s",
+                self.path,
+            )
+            self.dirty = True
+
+    def lock(self):
+        """Return the inter-process lock of the config file.
+
+        :return: FileLock
+        :rtype: FileLock
+
+        """
+
+        return file_lock(f"{self.path}.lock")
+
+    def read(self) -> None:
+        """Re-read the config file, e.g. to see a token refreshed by another
+        process."""
+
+        self.parser.read(self.path, encoding="utf-8")
+
+    def write(self) -> None:
+        """Atomically write the config file.
+
+        :raise RuntimeError: error while writing to the config file.
+
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=directory, prefix=".config-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as configfile:
+                    self.parser.write(configfile)
+                    configfile.flush()
+                    os.fsync(configfile.fileno())
+                os.replace(temp_path, self.path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except Exception as e:
+            logging.critical("Config file could not be saved: %s", str(e))
+            raise RuntimeError from e
+
+        self.dirty = False
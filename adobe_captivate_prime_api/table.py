@@ -0,0 +1,424 @@
+"""This module provides ``Table``, a columnar container to load large result
+sets such as every user's enrollments and analyse them without looping over
+dicts."""
+
+import logging
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def lookup(record: dict, path: str):
+    """Return the value at a dotted ``path`` of a record, ``None`` when any
+    part is missing.
+
+    :param record: dict
+    :param path: str, e.g. ``attributes.state``
+    :return: value or None
+    :rtype: str, int, float, bool, dict, list or None
+
+    """
+
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+
+    return value
+
+
+def learning_object_id(record: dict) -> str | None:
+    """Return the learning object id of an enrollment.
+
+    :param record: dict
+    :return: str or None
+
+    """
+
+    return lookup(record, "relationships.learningObject.data.id")
+
+
+def learning_object_type(record: dict) -> str | None:
+    """Return the ``loType`` of an enrollment, derived from the learning
+    object id (``course:123``) when the attribute is missing.
+
+    :param record: dict
+    :return: str or None
+
+    """
+
+    if (lo_type := lookup(record, "attributes.loType")) is None:
+        lo_id = learning_object_id(record)
+        if lo_id and ":" in lo_id:
+            lo_type = lo_id.split(":", 1)[0]
+
+    return lo_type
+
+
+ENROLLMENT_COLUMNS = {  # pylint:disable=consider-using-namedtuple-or-dataclass
+    "id": ("object", "id"),
+    "userId": ("category", "relationships.learner.data.id"),
+    "loId": ("category", learning_object_id),
+    "loType": ("category", learning_object_type),
+    "state": ("category", "attributes.state"),
+    "progressPercent": ("float", "attributes.progressPercent"),
+    "score": ("float", "attributes.score"),
+    "dateEnrolled": ("object", "attributes.dateEnrolled"),
+    "dateCompleted": ("object", "attributes.dateCompleted"),
+}
+
+USER_COLUMNS = {  # pylint:disable=consider-using-namedtuple-or-dataclass
+    "id": ("object", "id"),
+    "name": ("object", "attributes.name"),
+    "email": ("object", "attributes.email"),
+    "state": ("category", "attributes.state"),
+    "userType": ("category", "attributes.userType"),
+    "profile": ("category", "attributes.profile"),
+}
+
+
+class Table:
+    """Table Class.
+
+    Columnar storage of records. ``columns`` maps each column name to its kind
+    and to the dotted path (or a callable) extracting it from a record:
+
+    - ``category``: dictionary encoded, ``int32`` codes into ``categories``,
+      ``-1`` for missing values;
+    - ``float``: ``float64`` values, ``nan`` for missing values;
+    - ``object``: plain Python values.
+
+    Codes and floats live in ``array.array`` buffers, so appending is cheap;
+    with NumPy installed ``column`` returns zero-copy views and filters and
+    counts are vectorised. A buffer cannot grow while such a view is alive.
+
+    """
+
+    kinds = {
+        "category": "i",
+        "float": "d",
+        "object": None,
+    }
+
+    def __init__(self, columns: dict = None):
+        self.columns = dict(ENROLLMENT_COLUMNS if columns is None else columns)
+        self.data = {}
+        self.categories = {}
+        self.codes = {}
+        for name, (kind, _) in self.columns.items():
+            if kind not in self.kinds:
+                raise ValueError(f"Unknown kind {kind} of column {name}")
+            typecode = self.kinds[kind]
+            self.data[name] = array(typecode) if typecode else []
+            if kind == "category":
+                self.categories[name] = []
+                self.codes[name] = {}
+        self.length = 0
+
+    def append(self, record: dict) -> None:
+        """Append one record.
+
+        :param record: dict
+
+        """
+
+        for name, (kind, getter) in self.columns.items():
+            value = getter(record) if callable(getter) else lookup(record, getter)
+            if kind == "category":
+                value = self.encode(name, value)
+            elif kind == "float":
+                value = math.nan if value is None else float(value)
+            self.data[name].append(value)
+        self.length += 1
+
+    def extend(self, records: Iterable[dict]) -> "Table":
+        """Append records as they arrive, e.g. from an ``iter_*`` function.
+
+        :param records: Iterable[dict]
+        :return: the table itself
+
+        """
+
+        for record in records:
+            self.append(record)
+
+        return self
+
+    def encode(self, name: str, value) -> int:
+        """Return the code of a category, adding it when it is new.
+
+        :param name: str
+        :param value: category value
+        :type value: str, int, float or bool
+        :return: int
+
+        """
+
+        if value is None:
+            return -1
+
+        codes = self.codes[name]
+        if (code := codes.get(value)) is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+
+        return code
+
+    def column(self, name: str):
+        """Return the stored values of a column: codes for categories, a NumPy
+        view when NumPy is installed.
+
+        :param name: str
+        :return: numpy.ndarray, array.array or list
+        :rtype: numpy.ndarray, array.array or list
+
+        """
+
+        data = self.data[name]
+        if np is not None and isinstance(data, array):
+            return np.frombuffer(
+                data, dtype=np.int32 if data.typecode == "i" else float
+            )
+
+        return data
+
+    def values(self, name: str) -> list:
+        """Return the decoded values of a column.
+
+        :param name: str
+        :return: list
+
+        """
+
+        if name in self.categories:
+            categories = self.categories[name]
+            return [categories[code] if code >= 0 else None for code in self.data[name]]
+        if self.columns[name][0] == "float":
+            return [None if math.isnan(value) else value for value in self.data[name]]
+
+        return list(self.data[name])
+
+    def mask(self, name: str, accepted) -> list:
+        """Boolean mask of the rows whose value is ``accepted`` or, for a
+        list, tuple or set, one of its items.
+
+        :param name: str
+        :param accepted: value or collection of values
+        :type accepted: str, int, float, bool, list, tuple or set
+        :return: numpy.ndarray or list
+
+        """
+
+        if not isinstance(accepted, (list, tuple, set, frozenset)):
+            accepted = [accepted]
+
+        if name in self.categories:
+            codes = self.codes[name]
+            accepted = [codes[value] for value in accepted if value in codes]
+            if np is not None:
+                return np.isin(self.column(name), accepted)
+            accepted = set(accepted)
+            return [code in accepted for code in self.data[name]]
+
+        accepted = set(accepted)
+        return [value in accepted for value in self.data[name]]
+
+    def filter(self, **conditions) -> "Table":
+        """Return the rows matching every condition, e.g.
+        ``filter(state="COMPLETED", loType=["course", "certification"])``.
+
+        :param conditions: column name to accepted value(s)
+        :return: Table
+
+        """
+
+        selected = None
+        for name, accepted in conditions.items():
+            mask = self.mask(name, accepted)
+            if selected is None:
+                selected = mask
+            elif np is not None:
+                selected = np.logical_and(selected, mask)
+            else:
+                selected = [a and b for a, b in zip(selected, mask)]
+
+        return self.where([True] * self.length if selected is None else selected)
+
+    def where(self, mask) -> "Table":
+        """Return the rows where ``mask`` is true, e.g.
+        ``where(table.column("score") >= 80)``.
+
+        :param mask: sequence of booleans
+        :type mask: numpy.ndarray or list
+        :return: Table
+
+        """
+
+        if np is not None:
+            indices = np.flatnonzero(np.asarray(mask, dtype=bool))
+        else:
+            indices = [index for index, keep in enumerate(mask) if keep]
+
+        table = Table(self.columns)
+        for name, data in self.data.items():
+            if isinstance(data, array) and np is not None:
+                selected = self.column(name)[indices]
+                table.data[name] = array(data.typecode, selected.tobytes())
+            elif isinstance(data, array):
+                table.data[name] = array(data.typecode, (data[i] for i in indices))
+            else:
+                table.data[name] = [data[i] for i in indices]
+        for name, categories in self.categories.items():
+            table.categories[name] = list(categories)
+            table.codes[name] = dict(self.codes[name])
+        table.length = len(indices)
+
+        return table
+
+    def count(self, by: str = None) -> int | dict:
+        """Count the rows, per category of ``by`` when given.
+
+        :param by: str, name of a category column
+        :return: int or dict mapping each category (``None`` for missing) to
+            its number of rows
+
+        """
+
+        if by is None:
+            return self.length
+
+        categories = self.categories[by]
+        if np is not None:
+            codes = self.column(by)
+            counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+            result = {category: int(n) for category, n in zip(categories, counts) if n}
+            missing = int(np.count_nonzero(codes < 0))
+        else:
+            counter = Counter(self.data[by])
+            result = {
+                category: counter[code]
+                for code, category in enumerate(categories)
+                if counter[code]
+            }
+            missing = counter[-1]
+        if missing:
+            result[None] = missing
+
+        return result
+
+    def group_by(self, by: str, value: str, func: str = "mean") -> dict:
+        """Aggregate a float column per category of ``by``, ignoring missing
+        values.
+
+        :param by: str, name of a category column
+        :param value: str, name of a float column
+        :param func: str, ``sum``, ``mean``, ``min`` or ``max``
+        :return: dict mapping each category to the aggregate
+
+        """
+
+        functions = {
+            "sum": sum,
+            "mean": lambda values: sum(values) / len(values),
+            "min": min,
+            "max": max,
+        }
+        aggregate = functions[func]
+        categories = self.categories[by]
+
+        if np is not None and func in ("sum", "mean"):
+            codes, values = self.column(by), self.column(value)
+            keep = (codes >= 0) & ~np.isnan(values)
+            sums = np.bincount(
+                codes[keep], weights=values[keep], minlength=len(categories)
+            )
+            counts = np.bincount(codes[keep], minlength=len(categories))
+            return {
+                category: float(sums[code] if func == "sum" else sums[code] / n)
+                for code, (category, n) in enumerate(zip(categories, counts))
+                if n
+            }
+
+        groups = {}
+        for code, number in zip(self.data[by], self.data[value]):
+            if code >= 0 and not math.isnan(number):
+                groups.setdefault(categories[code], []).append(number)
+
+        return {category: aggregate(values) for category, values in groups.items()}
+
+    def to_pandas(self):
+        """Export to a ``pandas.DataFrame``; categories become
+        ``pandas.Categorical`` built on the stored codes.
+
+        :return: pandas.DataFrame
+        :rtype: pandas.DataFrame
+        :raises ImportError: pandas is not installed.
+
+        """
+
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError(
+                "Table.to_pandas requires pandas, install it with "
+                '"pip install pandas"'
+            ) from e
+
+        frame = {}
+        for name in self.columns:
+            if name in self.categories:
+                frame[name] = pd.Categorical.from_codes(
+                    self.column(name), categories=self.categories[name]
+                )
+            else:
+                frame[name] = self.column(name)
+
+        return pd.DataFrame(frame, copy=False)
+
+    def to_arrow(self):
+        """Export to a ``pyarrow.Table``; categories become dictionary arrays
+        over the stored codes.
+
+        :return: pyarrow.Table
+        :rtype: pyarrow.Table
+        :raises ImportError: pyarrow is not installed.
+
+        """
+
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                "Table.to_arrow requires pyarrow, install it with "
+                '"pip install pyarrow"'
+            ) from e
+
+        arrays = {}
+        for name in self.columns:
+            column = self.column(name)
+            if name in self.categories and np is not None:
+                indices = pa.array(column, type=pa.int32(), mask=column < 0)
+            elif name in self.categories:
+                indices = pa.array(
+                    [code if code >= 0 else None for code in column], type=pa.int32()
+                )
+            else:
+                arrays[name] = pa.array(column if np is not None else list(column))
+                continue
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                indices, pa.array(self.categories[name])
+            )
+
+        return pa.table(arrays)
+
+    def __len__(self) -> int:
+        return self.length
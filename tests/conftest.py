@@ -0,0 +1,74 @@
+"""Fixtures building clients that talk to the stub server of ``stub``."""
+import pytest
+import requests
+
+from adobe_captivate_prime_api import (
+    AsyncCaptivatePrimeAPI,
+    CaptivatePrimeAPI,
+    CredentialStore,
+)
+
+from .stub import (
+    SERVER_INSTANCE,
+    LocalAdapter,
+    LocalClientSession,
+    StubServer,
+)
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    stub.thread.start()
+    yield stub
+    stub.httpd.shutdown()
+    stub.httpd.server_close()
+
+
+@pytest.fixture
+def make_client(server):
+    """Build ``CaptivatePrimeAPI`` clients talking to the stub server."""
+
+    sessions = []
+
+    def factory(**kwargs):
+        session = requests.Session()
+        session.trust_env = False
+        session.mount("https://", LocalAdapter(server))
+        sessions.append(session)
+        kwargs.setdefault("store", CredentialStore())
+        return CaptivatePrimeAPI(
+            server_instance=SERVER_INSTANCE,
+            application_id="id",
+            application_secret="secret",
+            access_token=kwargs.pop("access_token", "access"),
+            refresh_token="refresh",
+            session=session,
+            **kwargs,
+        )
+
+    yield factory
+    for session in sessions:
+        session.close()
+
+
+@pytest.fixture
+def make_async_client(server):
+    """Build ``AsyncCaptivatePrimeAPI`` clients talking to the stub server;
+    they are used within ``async with``."""
+
+    def factory(**kwargs):
+        kwargs.setdefault("store", CredentialStore())
+        client = AsyncCaptivatePrimeAPI(
+            server_instance=SERVER_INSTANCE,
+            application_id="id",
+            application_secret="secret",
+            access_token=kwargs.pop("access_token", "access"),
+            refresh_token="refresh",
+            session=LocalClientSession(server),
+            **kwargs,
+        )
+        client.owns_session = True
+        return client
+
+    return factory
@@ -0,0 +1,181 @@
+"""Local stub of the Captivate Prime API for the tests.
+
+Both clients build their URLs from ``https://<server_instance>.adobe.com``;
+``LocalAdapter`` and ``LocalClientSession`` send every request to a plain HTTP
+server on ``127.0.0.1`` instead, which answers through handlers set by each
+test.
+"""
+import json
+import threading
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from urllib.parse import (
+    parse_qs,
+    urlencode,
+    urlsplit,
+)
+
+from requests.adapters import HTTPAdapter
+
+SERVER_INSTANCE = "stub"
+ORIGIN = f"https://{SERVER_INSTANCE}.adobe.com"
+
+
+def token_check(query: dict) -> tuple:
+    """Answer ``/oauth/token/check`` for any token."""
+
+    return 200, {
+        "expires_in": 3600,
+        "account_id": "1",
+        "user_id": "2",
+        "user_role": "admin",
+    }
+
+
+def token_refresh(query: dict) -> tuple:
+    """Answer ``/oauth/token/refresh`` with a new pair of tokens."""
+
+    return 200, {
+        "access_token": f"access-{time.monotonic_ns()}",
+        "refresh_token": f"refresh-{time.monotonic_ns()}",
+        "expires_in": 3600,
+    }
+
+
+def offset_pages(path: str, total: int, max_limit: int = None, delay: float = 0):
+    """Handler paging ``total`` users by ``page[offset]`` and ``page[limit]``.
+
+    With ``max_limit`` larger pages are rejected with a 400, like the API does
+    above its maximum page size.
+
+    :param path: str
+    :param total: int
+    :param max_limit: int
+    :param delay: float, seconds to wait before answering
+    :return: callable
+
+    """
+
+    def handler(query: dict) -> tuple:
+        time.sleep(delay)
+        offset = int(query.get("page[offset]", 0))
+        limit = int(query.get("page[limit]", 10))
+        if max_limit is not None and limit > max_limit:
+            return 400, {
+                "status": "400",
+                "title": "Bad Request",
+                "source": {"info": f"page[limit] must not exceed {max_limit}"},
+            }
+        body = {
+            "data": [
+                {"id": str(i), "type": "user", "attributes": {"name": f"user {i}"}}
+                for i in range(offset, min(offset + limit, total))
+            ],
+            "links": {},
+        }
+        if offset + limit < total:
+            next_query = urlencode(
+                {"page[offset]": offset + limit, "page[limit]": limit}
+            )
+            body["links"]["next"] = f"{ORIGIN}{path}?{next_query}"
+        return 200, body
+
+    return handler
+
+
+class StubServer:
+    """Threaded HTTP server answering with ``handlers[path](query)``, a
+    ``(status, body)`` tuple, and recording every request it receives."""
+
+    def __init__(self):
+        self.handlers = {
+            "/oauth/token/check": token_check,
+            "/oauth/token/refresh": token_refresh,
+        }
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.request_handler())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def request_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint:disable=invalid-name
+                stub.answer(self)
+
+            def do_POST(self):  # pylint:disable=invalid-name
+                stub.answer(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def answer(self, handler: BaseHTTPRequestHandler) -> None:
+        url = urlsplit(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests.append((handler.command, url.path, query))
+        status, body = self.handlers[url.path](query)
+        content = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def calls(self, path: str) -> list:
+        """Return the query of every request received for ``path``."""
+
+        with self.lock:
+            return [query for _, p, query in self.requests if p == path]
+
+    def local_url(self, url: str) -> str:
+        """Point ``url`` of the API at this server."""
+
+        parts = urlsplit(url)
+        return f"{self.base_url}{parts.path}" + (
+            f"?{parts.query}" if parts.query else ""
+        )
+
+
+class LocalAdapter(HTTPAdapter):
+    """``requests`` adapter sending every request to the stub server."""
+
+    def __init__(self, server: StubServer):
+        super().__init__()
+        self.server = server
+
+    def send(self, request, **kwargs):  # pylint:disable=arguments-differ
+        request.url = self.server.local_url(request.url)
+        return super().send(request, **kwargs)
+
+
+class LocalClientSession:
+    """Stand-in for ``aiohttp.ClientSession`` sending every request to the
+    stub server. It is created lazily so it binds to the running loop."""
+
+    def __init__(self, server: StubServer):
+        self.server = server
+        self.session = None
+
+    @property
+    def closed(self) -> bool:
+        return self.session is not None and self.session.closed
+
+    def request(self, method: str, url: str, **kwargs):
+        import aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        return self.session.request(method, self.server.local_url(url), **kwargs)
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
@@ -0,0 +1,159 @@
+"""Resumable scans of ``iter_fetch`` with a ``checkpoint``."""
+import asyncio
+
+import pytest
+
+from adobe_captivate_prime_api import (
+    FileCheckpoint,
+    RetryPolicy,
+    SQLiteCheckpoint,
+)
+from adobe_captivate_prime_api.params import canonical_url
+
+from .stub import (
+    ORIGIN,
+    offset_pages,
+)
+
+PATH = "/primeapi/v2/users"
+PARAMS = {"page[offset]": 0, "page[limit]": 10}
+KEY = canonical_url(f"{ORIGIN}{PATH}", PARAMS)
+
+
+def failing_pages(total: int, offset: int):
+    """Handler paging ``total`` users that answers the page at ``offset``
+    with a 503 until ``handler.failing`` is set to False.
+
+    :param total: int
+    :param offset: int
+    :return: callable
+
+    """
+
+    pages = offset_pages(PATH, total=total)
+
+    def handler(query: dict) -> tuple:
+        if handler.failing and int(query["page[offset]"]) == offset:
+            return 503, {
+                "status": "503",
+                "title": "Service Unavailable",
+                "source": {"info": "try again"},
+            }
+        return pages(query)
+
+    handler.failing = True
+
+    return handler
+
+
+def ids(records: list) -> list:
+    """Return the ids of ``records`` as numbers, in order."""
+
+    return [int(record["id"]) for record in records]
+
+
+def offsets(server, start: int = 0) -> list:
+    """Return the offsets of the pages requested from the stub, from the
+    ``start``-th request on."""
+
+    return [int(query["page[offset]"]) for query in server.calls(PATH)[start:]]
+
+
+def scan_until_failure(records: list, pages) -> None:
+    """Collect records of ``pages`` into ``records`` until the scan fails."""
+
+    with pytest.raises(Exception) as excinfo:
+        for record in pages:
+            records.append(record)
+    assert isinstance(excinfo.value.__cause__, RuntimeError)
+
+
+def test_scan_resumes_from_the_checkpoint(server, make_client, tmp_path):
+    server.handlers[PATH] = handler = failing_pages(total=45, offset=30)
+    checkpoint = FileCheckpoint(str(tmp_path / "checkpoints.json"))
+    client = make_client(retry=RetryPolicy(max_attempts=1))
+
+    records = []
+    scan_until_failure(
+        records,
+        client.iter_fetch("GET", "users", params=PARAMS, checkpoint=checkpoint),
+    )
+    assert ids(records) == list(range(30))
+    assert checkpoint.load(KEY)["records"] == 30
+
+    handler.failing = False
+    sent = len(server.calls(PATH))
+    records = client.fetch("GET", "users", params=PARAMS, checkpoint=checkpoint)
+
+    assert ids(records) == list(range(30, 45))
+    assert offsets(server, sent) == [30, 40]
+    assert checkpoint.load(KEY) is None
+
+
+def test_resumed_scan_counts_records_towards_max_items(server, make_client, tmp_path):
+    server.handlers[PATH] = handler = failing_pages(total=45, offset=30)
+    checkpoint = FileCheckpoint(str(tmp_path / "checkpoints.json"))
+    client = make_client(retry=RetryPolicy(max_attempts=1))
+
+    records = []
+    scan_until_failure(
+        records,
+        client.iter_fetch(
+            "GET", "users", params=PARAMS, max_items=35, checkpoint=checkpoint
+        ),
+    )
+    assert ids(records) == list(range(30))
+
+    handler.failing = False
+    records = client.fetch(
+        "GET", "users", params=PARAMS, max_items=35, checkpoint=checkpoint
+    )
+
+    assert ids(records) == list(range(30, 35))
+    assert checkpoint.load(KEY) is None
+
+
+def test_early_stop_clears_the_checkpoint(server, make_client, tmp_path):
+    server.handlers[PATH] = offset_pages(PATH, total=45)
+    checkpoint = FileCheckpoint(str(tmp_path / "checkpoints.json"))
+    client = make_client()
+
+    records = client.fetch(
+        "GET", "users", params=PARAMS, max_items=15, checkpoint=checkpoint
+    )
+
+    assert ids(records) == list(range(15))
+    assert checkpoint.load(KEY) is None
+
+    sent = len(server.calls(PATH))
+    records = client.fetch("GET", "users", params=PARAMS, checkpoint=checkpoint)
+
+    assert ids(records) == list(range(45))
+    assert offsets(server, sent)[0] == 0
+
+
+def test_async_scan_resumes_from_the_checkpoint(server, make_async_client, tmp_path):
+    server.handlers[PATH] = handler = failing_pages(total=45, offset=30)
+    checkpoint = SQLiteCheckpoint(str(tmp_path / "checkpoints.db"))
+
+    async def main():
+        async with make_async_client(retry=RetryPolicy(max_attempts=1)) as client:
+            records = []
+            with pytest.raises(Exception) as excinfo:
+                async for record in client.fetch(
+                    "GET", "users", params=PARAMS, stream=True, checkpoint=checkpoint
+                ):
+                    records.append(record)
+            assert isinstance(excinfo.value.__cause__, RuntimeError)
+            assert ids(records) == list(range(30))
+
+            handler.failing = False
+            return await client.fetch(
+                "GET", "users", params=PARAMS, checkpoint=checkpoint
+            )
+
+    records = asyncio.run(main())
+
+    assert ids(records) == list(range(30, 45))
+    assert offsets(server)[-2:] == [30, 40]
+    assert checkpoint.load(KEY) is None
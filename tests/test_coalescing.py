@@ -0,0 +1,86 @@
+"""Coalescing of identical in-flight page requests."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .stub import (
+    ORIGIN,
+    offset_pages,
+)
+
+PATH = "/primeapi/v2/users"
+URL = f"{ORIGIN}{PATH}"
+PARAMS = {"page[offset]": 0, "page[limit]": 10}
+
+
+def test_threads_share_one_request(server, make_client):
+    server.handlers[PATH] = offset_pages(PATH, total=25, delay=0.2)
+    client = make_client()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(
+            executor.map(lambda _: client.get_page(URL, params=PARAMS), range(4))
+        )
+
+    assert len(server.calls(PATH)) == 1
+    assert {r.status_code for r in responses} == {200}
+    assert not client.in_flight
+
+
+def test_tasks_share_one_request(server, make_async_client):
+    server.handlers[PATH] = offset_pages(PATH, total=25, delay=0.2)
+
+    async def main():
+        async with make_async_client() as client:
+            return await asyncio.gather(
+                *(client.get_page(URL, params=PARAMS) for _ in range(4))
+            )
+
+    responses = asyncio.run(main())
+
+    assert len(server.calls(PATH)) == 1
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+
+
+def test_cancelled_waiter_leaves_request_to_the_others(server, make_async_client):
+    server.handlers[PATH] = offset_pages(PATH, total=25, delay=0.3)
+
+    async def main():
+        async with make_async_client() as client:
+            cancelled = asyncio.create_task(client.get_page(URL, params=PARAMS))
+            waiting = asyncio.create_task(client.get_page(URL, params=PARAMS))
+            await asyncio.sleep(0.1)
+            cancelled.cancel()
+            r = await waiting
+            assert cancelled.cancelled()
+            assert not client.in_flight
+            return r
+
+    r = asyncio.run(main())
+
+    assert r.status_code == 200
+    assert [record["id"] for record in r.json()["data"]] == [str(i) for i in range(10)]
+    assert len(server.calls(PATH)) == 1
+
+
+def test_request_is_cancelled_with_its_last_waiter(server, make_async_client):
+    server.handlers[PATH] = offset_pages(PATH, total=25, delay=0.3)
+
+    async def main():
+        async with make_async_client() as client:
+            waiters = [
+                asyncio.create_task(client.get_page(URL, params=PARAMS))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.1)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            assert not client.in_flight
+
+            r = await client.get_page(URL, params=PARAMS)
+            assert r.status_code == 200
+
+    asyncio.run(main())
+
+    assert len(server.calls(PATH)) == 2
@@ -0,0 +1,101 @@
+"""Parallel offset windows of ``iter_fetch`` with ``parallel``."""
+import asyncio
+
+import pytest
+
+from adobe_captivate_prime_api import PagingPolicy
+
+from .stub import offset_pages
+
+PATH = "/primeapi/v2/users"
+PARAMS = {"page[offset]": 0, "page[limit]": 10}
+
+
+def offsets(server) -> list:
+    """Return the sorted offsets of the pages requested from the stub."""
+
+    return sorted(int(query["page[offset]"]) for query in server.calls(PATH))
+
+
+def limits(server) -> set:
+    """Return the page sizes requested from the stub."""
+
+    return {query["page[limit]"] for query in server.calls(PATH)}
+
+
+def ids(records: list) -> list:
+    """Return the ids of ``records`` as numbers, in order."""
+
+    return [int(record["id"]) for record in records]
+
+
+def test_windows_stop_on_a_short_page(server, make_client):
+    server.handlers[PATH] = offset_pages(PATH, total=45)
+    client = make_client()
+
+    records = client.fetch("GET", "users", params=PARAMS, parallel=2)
+
+    assert ids(records) == list(range(45))
+    # The window after the short page at 40 may be in flight already, none
+    # past it is requested.
+    assert offsets(server) in ([0, 10, 20, 30, 40], [0, 10, 20, 30, 40, 50])
+
+
+def test_async_windows_stop_on_a_short_page(server, make_async_client):
+    server.handlers[PATH] = offset_pages(PATH, total=45)
+
+    async def main():
+        async with make_async_client() as client:
+            return await client.fetch("GET", "users", params=PARAMS, parallel=2)
+
+    records = asyncio.run(main())
+
+    assert ids(records) == list(range(45))
+    assert offsets(server) in ([0, 10, 20, 30, 40], [0, 10, 20, 30, 40, 50])
+
+
+def test_windows_step_down_when_the_page_size_is_rejected(server, make_client):
+    server.handlers[PATH] = offset_pages(PATH, total=95, max_limit=50)
+    client = make_client(paging=PagingPolicy(max_size=100))
+
+    records = client.fetch("GET", "users", params=PARAMS, parallel=3)
+
+    assert ids(records) == list(range(95))
+    assert "100" in limits(server)
+    assert client.paging.size("users") == 50
+
+
+def test_async_windows_step_down_when_the_page_size_is_rejected(
+    server, make_async_client
+):
+    server.handlers[PATH] = offset_pages(PATH, total=95, max_limit=50)
+
+    async def main():
+        async with make_async_client(paging=PagingPolicy(max_size=100)) as client:
+            return await client.fetch("GET", "users", params=PARAMS, parallel=3)
+
+    records = asyncio.run(main())
+
+    assert ids(records) == list(range(95))
+    assert "100" in limits(server)
+
+
+def test_failed_window_raises(server, make_client):
+    pages = offset_pages(PATH, total=45)
+
+    def handler(query: dict) -> tuple:
+        if query["page[offset]"] == "20":
+            return 404, {
+                "status": "404",
+                "title": "Not Found",
+                "source": {"info": "gone"},
+            }
+        return pages(query)
+
+    server.handlers[PATH] = handler
+    client = make_client()
+
+    with pytest.raises(Exception) as excinfo:
+        client.fetch("GET", "users", params=PARAMS, parallel=2)
+
+    assert isinstance(excinfo.value.__cause__, RuntimeError)
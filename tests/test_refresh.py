@@ -0,0 +1,105 @@
+"""Single-flight refresh of the access token."""
+import asyncio
+import threading
+import time
+
+from adobe_captivate_prime_api import ConfigFileStore
+
+from .stub import token_refresh
+
+
+def slow_refresh(query: dict) -> tuple:
+    """Answer ``/oauth/token/refresh`` slowly, so concurrent refreshes overlap."""
+
+    time.sleep(0.2)
+    return token_refresh(query)
+
+
+def run_together(functions: list) -> None:
+    """Call ``functions`` on threads released at the same time."""
+
+    barrier = threading.Barrier(len(functions))
+    errors = []
+
+    def run(function):
+        barrier.wait()
+        try:
+            function()
+        except Exception as e:  # pylint:disable=broad-except
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(f,)) for f in functions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_refresh_is_single_flight_across_threads(server, make_client):
+    server.handlers["/oauth/token/refresh"] = slow_refresh
+    client = make_client()
+
+    run_together([client.refresh_access_token] * 8)
+
+    assert len(server.calls("/oauth/token/refresh")) == 1
+    assert client.access_token.startswith("access-")
+
+
+def test_refresh_is_single_flight_across_clients(server, make_client, tmp_path):
+    server.handlers["/oauth/token/refresh"] = slow_refresh
+    path = str(tmp_path / "config.cfg")
+    clients = [make_client(store=ConfigFileStore(path)) for _ in range(4)]
+
+    run_together([client.refresh_access_token for client in clients])
+
+    assert len(server.calls("/oauth/token/refresh")) == 1
+    assert len({client.access_token for client in clients}) == 1
+    assert ConfigFileStore(path).get("CAPTIVATE", "access_token") == (
+        clients[0].access_token
+    )
+
+
+def test_async_refresh_is_single_flight_across_clients(
+    server, make_async_client, tmp_path
+):
+    server.handlers["/oauth/token/refresh"] = slow_refresh
+    path = str(tmp_path / "config.cfg")
+
+    async def main():
+        clients = [make_async_client(store=ConfigFileStore(path)) for _ in range(4)]
+        try:
+            await asyncio.gather(*(client.refresh_access_token() for client in clients))
+        finally:
+            for client in clients:
+                await client.close()
+        return clients
+
+    clients = asyncio.run(main())
+
+    assert len(server.calls("/oauth/token/refresh")) == 1
+    assert len({client.access_token for client in clients}) == 1
+
+
+def test_async_and_sync_clients_share_one_refresh(
+    server, make_client, make_async_client, tmp_path
+):
+    server.handlers["/oauth/token/refresh"] = slow_refresh
+    path = str(tmp_path / "config.cfg")
+    client = make_client(store=ConfigFileStore(path))
+
+    async def main():
+        async_client = make_async_client(store=ConfigFileStore(path))
+        try:
+            await asyncio.gather(
+                async_client.refresh_access_token(),
+                asyncio.to_thread(client.refresh_access_token),
+            )
+        finally:
+            await async_client.close()
+        return async_client
+
+    async_client = asyncio.run(main())
+
+    assert len(server.calls("/oauth/token/refresh")) == 1
+    assert async_client.access_token == client.access_token